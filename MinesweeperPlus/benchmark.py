@@ -0,0 +1,231 @@
+# benchmark.py
+# Seeded benchmarks of the game-logic and rendering hot paths, with JSON results
+# and a comparison against a stored baseline to catch regressions
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import numpy as np
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")  # Render offscreen; no window opens
+import pygame
+from constants import *
+from clock import ManualClock
+from config import PRESETS, BOARD_AREA
+from game_logic import Game
+from renderer import Renderer
+
+SIZES = (15, 100, 1000)
+RUNS = {15: 100, 100: 20, 1000: 5}  # Timed runs per case at each board size
+THRESHOLD = 0.25  # Slowdown of the median over the baseline that counts as a regression
+
+def board(size, **changes):
+    """Square board at the classic mine density, with a time limit nothing reaches"""
+    return PRESETS["classic"].replace(rows=size, cols=size, time_limit=10 ** 9, **changes)
+
+
+def started(config, seed):
+    """Game on a manual clock, after a first click in the middle of the board"""
+    game = Game(config, seed=seed, clock=ManualClock())
+    game.reveal_cell(config.rows // 2, config.cols // 2)
+    return game
+
+
+# Each case sets up from a seed and returns the timed step, which may return how many operations it ran
+
+def place_mines(size, seed):
+    game = Game(board(size), seed=seed, clock=ManualClock())
+    return lambda: game.place_mines(size // 2, size // 2)
+
+
+def first_click(size, seed):
+    """Mine and power-up placement plus the opening cascade"""
+    game = Game(board(size), seed=seed, clock=ManualClock())
+    return lambda: game.reveal_cell(size // 2, size // 2)
+
+
+def cascade(size, seed):
+    """Worst case: one mine, so a corner click floods the whole board"""
+    game = Game(board(size, mine_count=1, power_up_count=0), seed=seed, clock=ManualClock())
+    return lambda: game.reveal_cell(0, 0)
+
+
+def full_clear(size, seed):
+    """Click every safe cell still hidden, in order, until the board is won"""
+    game = started(board(size), seed)
+    safe = np.flatnonzero(~game.board.mines).tolist()
+    revealed = game.board.revealed.reshape(-1)
+
+    def run():
+        clicks = 0
+        for index in safe:
+            if not revealed[index]:
+                game.reveal_cell(*divmod(index, size))
+                clicks += 1
+        assert game.game_won
+        return clicks
+    return run
+
+
+def hint(size, seed, count=20):
+    """Solver-backed hints after the opening"""
+    game = started(board(size), seed)
+    game.hint_uses_left = count
+
+    def run():
+        for _ in range(count):
+            game.use_hint()
+        return count
+    return run
+
+
+def radar(size, seed, count=1000):
+    game = started(board(size), seed)
+    game.radar_uses_left = count
+    cells = np.random.default_rng(seed).integers(size, size=(count, 2)).tolist()
+
+    def run():
+        for row, col in cells:
+            game.radar_at(row, col)
+        return count
+    return run
+
+
+def _renderer(config):
+    if not pygame.display.get_init():
+        pygame.init()
+        pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+    return Renderer(pygame.display.get_surface(), config)
+
+
+def render_build(size, seed):
+    """First frame of a game: background, visible chunks and HUD"""
+    config = board(size)
+    renderer = _renderer(config)
+    game = started(config, seed)
+    return lambda: renderer.draw_game(game)
+
+
+def render_frame(size, seed, count=20):
+    """Frames that each follow one click"""
+    config = board(size)
+    renderer = _renderer(config)
+    game = started(config, seed)
+    renderer.draw_game(game)
+    hidden = np.flatnonzero(~(game.board.mines | game.board.revealed))
+    cells = np.random.default_rng(seed).choice(hidden, size=min(count, hidden.size), replace=False).tolist()
+
+    def run():
+        for index in cells:
+            game.reveal_cell(*divmod(index, size))
+            renderer.draw_game(game)
+        return len(cells)
+    return run
+
+
+def render_pan(size, seed, count=20):
+    """Frames that each scroll the view. Cells are made big enough that the board
+    outgrows the view by every pixel panned, so each frame really scrolls."""
+    config = board(size)
+    reach = max(BOARD_AREA) + count * PAN_SPEED  # Board pixels needed along each side
+    config = config.replace(cell_size=max(config.cell_size, -(-reach // size)))
+    renderer = _renderer(config)
+    game = started(config, seed)
+    renderer.draw_game(game)
+
+    def run():
+        for _ in range(count):
+            renderer.pan(PAN_SPEED, PAN_SPEED)
+            renderer.draw_game(game)
+        return count
+    return run
+
+
+CASES = {
+    "place_mines": place_mines,
+    "first_click": first_click,
+    "cascade": cascade,
+    "full_clear": full_clear,
+    "hint": hint,
+    "radar": radar,
+    "render_build": render_build,
+    "render_frame": render_frame,
+    "render_pan": render_pan,
+}
+
+
+def measure(case, size, runs):
+    """Time `runs` seeded runs of a case; returns ms per operation statistics"""
+    per_op = []
+    for seed in range(runs):
+        step = case(size, seed)
+        start = time.perf_counter()
+        ops = step()
+        ops = ops if isinstance(ops, int) else 1
+        per_op.append((time.perf_counter() - start) * 1000 / ops)
+    per_op = np.array(per_op)
+    return {"median_ms": float(np.median(per_op)), "min_ms": float(per_op.min()),
+            "max_ms": float(per_op.max()), "runs": runs}
+
+
+def run_benchmarks(cases=None, sizes=SIZES, scale=1.0, progress=None):
+    """Results keyed "case/size", plus the environment they were measured in"""
+    results = {}
+    for name in cases or CASES:
+        for size in sizes:
+            results[f"{name}/{size}"] = measure(CASES[name], size, max(1, round(RUNS.get(size, 3) * scale)))
+            if progress:
+                progress(f"{name}/{size}", results[f"{name}/{size}"])
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": f"{platform.system()} {platform.machine()} ({platform.processor() or 'unknown cpu'})",
+        "results": results,
+    }
+
+
+def compare(current, baseline, threshold=THRESHOLD):
+    """(key, current ms, baseline ms, ratio, regressed) for every key in both.
+    Medians are compared: runs use different seeds, so the fastest may just be an easy board."""
+    rows = []
+    for key, result in current["results"].items():
+        before = baseline["results"].get(key)
+        if before is None:
+            continue
+        ratio = result["median_ms"] / max(before["median_ms"], 1e-9)
+        rows.append((key, result["median_ms"], before["median_ms"], ratio, ratio > 1 + threshold))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Minesweeper+ hot paths on seeded boards")
+    parser.add_argument("--cases", nargs="+", choices=list(CASES), help="default: all")
+    parser.add_argument("--sizes", nargs="+", type=int, default=list(SIZES))
+    parser.add_argument("--scale", type=float, default=1.0, help="multiply the number of runs per case")
+    parser.add_argument("--output", help="write the results as JSON, e.g. to store a baseline")
+    parser.add_argument("--baseline", help="JSON results to compare against")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD,
+                        help="relative slowdown that counts as a regression (default %(default)s)")
+    args = parser.parse_args()
+
+    def progress(key, result):
+        print(f"{key:>20}: {result['median_ms']:10.4f} ms/op (min {result['min_ms']:.4f}, {result['runs']} runs)",
+              flush=True)
+    current = run_benchmarks(args.cases, args.sizes, args.scale, progress)
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(current, file, indent=2)
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        rows = compare(current, baseline, args.threshold)
+        print(f"\n{'case':>20}  {'now ms':>10}  {'base ms':>10}  change")
+        for key, now, before, ratio, regressed in rows:
+            print(f"{key:>20}  {now:10.4f}  {before:10.4f}  {ratio - 1:+7.1%}{'  REGRESSION' if regressed else ''}")
+        if any(row[4] for row in rows):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
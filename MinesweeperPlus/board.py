@@ -0,0 +1,187 @@
+# board.py
+# Packed board storage backed by NumPy arrays
+import functools
+from itertools import compress
+import numpy as np
+from constants import *
+from cell import Cell
+
+NEIGHBOR_OFFSETS = [(dr, dc) for dr in (-1, 0, 1) for dc in (-1, 0, 1) if dr or dc]
+_ROW_OFFSETS = np.array([dr for dr, dc in NEIGHBOR_OFFSETS])
+_COL_OFFSETS = np.array([dc for dr, dc in NEIGHBOR_OFFSETS])
+NEIGHBOR_TABLE_CELLS = 1 << 16  # Boards up to this size look neighbors up in a table shared by every game
+
+@functools.lru_cache(maxsize=8)
+def _neighbor_table(rows, cols):
+    """Neighbor indices of every cell of a board size, one tuple per flat index"""
+    index = np.arange(rows * cols)
+    r = index[:, None] // cols + _ROW_OFFSETS
+    c = index[:, None] % cols + _COL_OFFSETS
+    inside = (r >= 0) & (r < rows) & (c >= 0) & (c < cols)
+    return [tuple(compress(around, keep)) for around, keep in zip((r * cols + c).tolist(), inside.tolist())]
+
+def neighbor_sum(mask):
+    """For every cell, how many of its 8 neighbors are set in a boolean mask,
+    or the sum of their values in a numeric array"""
+    rows, cols = mask.shape
+    padded = np.zeros((rows + 2, cols + 2), dtype=np.uint8 if mask.dtype == bool else mask.dtype)
+    padded[1:-1, 1:-1] = mask
+    # The 3x3 box sum is separable: sum along rows, then along columns
+    horizontal = padded[:, :-2] + padded[:, 1:-1] + padded[:, 2:]
+    box = horizontal[:-2] + horizontal[1:-1] + horizontal[2:]
+    return box - padded[1:-1, 1:-1]
+
+class BoardState:
+    """Stores every per-cell attribute as one NumPy layer instead of Cell objects"""
+    def __init__(self, rows, cols):
+        self.rows = rows
+        self.cols = cols
+        shape = (rows, cols)
+        self.mines = np.zeros(shape, dtype=bool)
+        self.revealed = np.zeros(shape, dtype=bool)
+        self.flagged = np.zeros(shape, dtype=bool)
+        self.neighbors = np.zeros(shape, dtype=np.uint8)
+        self.power_ups = np.zeros(shape, dtype=np.uint8)  # Index into POWER_UP_TYPES
+        self.dirty = []  # Flat index arrays of cells whose appearance changed since the last draw
+        self._neighbors = _neighbor_table(rows, cols) if rows * cols <= NEIGHBOR_TABLE_CELLS else None
+
+    def __len__(self):
+        return self.rows
+
+    def __getitem__(self, row):
+        """Support the old grid[row][col] access pattern"""
+        if not 0 <= row < self.rows:
+            raise IndexError(row)
+        return _RowView(self, row)
+
+    def __iter__(self):
+        for row in range(self.rows):
+            yield _RowView(self, row)
+
+    def in_bounds(self, row, col):
+        return 0 <= row < self.rows and 0 <= col < self.cols
+
+    def neighbor_indices(self, index):
+        """Flat indices of the up to 8 cells around a flat index, as a tuple"""
+        if self._neighbors is not None:
+            return self._neighbors[index]
+        row, col = divmod(index, self.cols)
+        return tuple([r * self.cols + c
+                      for r in range(max(row - 1, 0), min(row + 2, self.rows))
+                      for c in range(max(col - 1, 0), min(col + 2, self.cols))
+                      if r != row or c != col])
+
+    def place_mines(self, count, rng, safe_row, safe_col, safe_radius=0):
+        """Place mines by sampling without replacement, so there are no retries at any density.
+        The safe cell and the square of safe_radius around it are left out of the index space."""
+        rows = np.arange(max(safe_row - safe_radius, 0), min(safe_row + safe_radius, self.rows - 1) + 1)
+        cols = np.arange(max(safe_col - safe_radius, 0), min(safe_col + safe_radius, self.cols - 1) + 1)
+        excluded = (rows[:, None] * self.cols + cols).reshape(-1)  # Sorted flat indices
+        eligible = self.rows * self.cols - excluded.size
+        if count > eligible:
+            raise ValueError(f"Cannot place {count} mines in {eligible} eligible cells")
+        picks = rng.choice(eligible, size=count, replace=False)
+        # Shift each pick past every excluded index at or below it
+        picks += np.searchsorted(excluded - np.arange(excluded.size), picks, side="right")
+        self.mines.reshape(-1)[picks] = True
+        self.compute_neighbors()
+
+    def place_power_ups(self, count, rng):
+        """Scatter power-ups over non-mine cells and return their flat indices and type codes"""
+        free = np.flatnonzero(~self.mines)
+        picks = rng.choice(free, size=min(count, free.size), replace=False)
+        codes = rng.integers(1, len(POWER_UP_TYPES), size=picks.size)
+        self.power_ups.reshape(-1)[picks] = codes
+        return picks, codes
+
+    def compute_neighbors(self):
+        """Recount neighbor mines for the whole board in one padded shift-sum"""
+        self.neighbors = neighbor_sum(self.mines)
+
+    def move_mine(self, from_row, from_col, to_row, to_col):
+        """Move one mine and patch only the two affected 3x3 neighborhoods"""
+        self.mines[from_row, from_col] = False
+        self.neighbors[from_row, from_col] += 1  # A cell is not its own neighbor
+        self.neighbors[max(from_row - 1, 0):from_row + 2, max(from_col - 1, 0):from_col + 2] -= 1
+        self.mines[to_row, to_col] = True
+        self.neighbors[max(to_row - 1, 0):to_row + 2, max(to_col - 1, 0):to_col + 2] += 1
+        self.neighbors[to_row, to_col] -= 1
+
+    def flood_reveal(self, row, col):
+        """Reveal a cell and, if it is a zero, its whole zero-region.
+        Works breadth-first on flat index arrays, one frontier per pass, so there is
+        no recursion and the cost is linear in the size of the region.
+        Returns the flat indices of every newly revealed cell, clicked cell first."""
+        cols = self.cols
+        start = np.array([row * cols + col])
+        self.revealed[row, col] = True
+        if self.mines[row, col] or self.neighbors[row, col]:
+            self.dirty.append(start)
+            return start
+        revealed = self.revealed.reshape(-1)
+        flagged = self.flagged.reshape(-1)
+        neighbors = self.neighbors.reshape(-1)
+        found = [start]
+        frontier = start
+        while frontier.size:
+            # All 8 neighbors of the whole frontier at once
+            r = frontier[:, None] // cols + _ROW_OFFSETS
+            c = frontier[:, None] % cols + _COL_OFFSETS
+            inside = (r >= 0) & (r < self.rows) & (c >= 0) & (c < cols)
+            candidates = np.unique(r[inside] * cols + c[inside])
+            candidates = candidates[~(revealed[candidates] | flagged[candidates])]
+            revealed[candidates] = True
+            found.append(candidates)
+            # Neighbors of a zero are never mines, so only zeros keep spreading
+            frontier = candidates[neighbors[candidates] == 0]
+        found = np.concatenate(found)
+        self.dirty.append(found)
+        return found
+
+    def set_flag(self, row, col, flagged):
+        self.flagged[row, col] = flagged
+        self.dirty.append(np.array([row * self.cols + col]))
+
+    def reveal_mines(self):
+        """Reveal every mine that is still hidden"""
+        hidden = np.flatnonzero(self.mines & ~self.revealed)
+        self.revealed.reshape(-1)[hidden] = True
+        self.dirty.append(hidden)
+
+    def pop_dirty(self):
+        """Return the flat indices of changed cells and start a new batch"""
+        if not self.dirty:
+            return np.empty(0, dtype=np.intp)
+        dirty = np.unique(np.concatenate(self.dirty))
+        self.dirty = []
+        return dirty
+
+    def cell(self, row, col):
+        """Return a Cell view of one position"""
+        return Cell(self, row, col)
+
+    def nbytes(self):
+        """Memory used by all layers"""
+        return (self.mines.nbytes + self.revealed.nbytes + self.flagged.nbytes +
+                self.neighbors.nbytes + self.power_ups.nbytes)
+
+
+class _RowView:
+    """One row of the board, indexable by column"""
+    __slots__ = ("board", "row")
+
+    def __init__(self, board, row):
+        self.board = board
+        self.row = row
+
+    def __len__(self):
+        return self.board.cols
+
+    def __getitem__(self, col):
+        if not 0 <= col < self.board.cols:
+            raise IndexError(col)
+        return Cell(self.board, self.row, col)
+
+    def __iter__(self):
+        for col in range(self.board.cols):
+            yield Cell(self.board, self.row, col)
@@ -0,0 +1,170 @@
+# board_pool.py
+# Ready-made no-guess layouts, generated by a background thread and kept on disk
+# between runs, so the first click never waits for the generator
+import os
+import struct
+import threading
+import time
+from collections import deque
+import numpy as np
+from constants import *
+from config import safe_area
+from generator import generate_no_guess
+
+BLOCK = 3  # First clicks are grouped into 3x3 blocks of cells
+POOL_SAFE_RADIUS = 2  # Mine-free square around a block's center: 5x5, so it covers every click in the block
+_MAGIC = b"MSPOOL2\n"
+_RECORD = struct.Struct("<HHIHHdI")  # rows, cols, mines, block row, block col, created (epoch s), packed bytes
+
+def block_center(rows, cols, block_row, block_col):
+    return min(block_row * BLOCK + 1, rows - 1), min(block_col * BLOCK + 1, cols - 1)
+
+
+def poolable(rows, cols, mine_count):
+    """Whether the mines fit outside the mine-free square around a block's center"""
+    return mine_count <= rows * cols - safe_area(rows, cols, POOL_SAFE_RADIUS)
+
+
+class BoardPool:
+    """Bounded queues of no-guess layouts keyed by (rows, cols, mines, block row, block col).
+    A layout is generated for the center of its 3x3 block with everything within
+    2 cells of the center mine-free. Any click in the block is then a zero that
+    touches the center, so it opens the same area the solver started from, and
+    one layout serves all nine first clicks. A board too dense to keep that
+    square clear is not pooled; its layouts are generated at the click.
+    Only the blocks nearest the middle of a board are kept ready, and the pool
+    as a whole holds at most `limit` layouts: once full, layouts of boards no
+    longer warmed make room, oldest first, and otherwise the worker waits."""
+    def __init__(self, path=BOARD_POOL_FILE, per_key=BOARD_POOL_SIZE, max_age=BOARD_POOL_MAX_AGE,
+                 blocks=BOARD_POOL_BLOCKS, limit=BOARD_POOL_LIMIT):
+        self.path = path
+        self.per_key = per_key  # Layouts kept per key; the oldest go first
+        self.max_age = max_age  # Seconds a stored layout stays usable
+        self.blocks = blocks  # First-click blocks warmed per board
+        self.limit = limit  # Layouts in the whole pool
+        self.rng = np.random.default_rng()
+        self._queues = {}  # key -> deque of (created, packed layout)
+        self._wanted = []  # Keys the worker keeps full, in fill order
+        self._lock = threading.Lock()
+        self._wake = threading.Condition(self._lock)
+        self._thread = None
+        self._running = False
+
+    def warm(self, rows, cols, mine_count):
+        """Keep layouts ready for the first-click blocks nearest the middle of this board"""
+        if not poolable(rows, cols, mine_count):
+            return
+        block_rows, block_cols = (rows + BLOCK - 1) // BLOCK, (cols + BLOCK - 1) // BLOCK
+        blocks = [(block_row, block_col) for block_row in range(block_rows) for block_col in range(block_cols)]
+        # Nearest the middle first: distance in half blocks, square rings outward
+        blocks.sort(key=lambda block: max(abs(2 * block[0] + 1 - block_rows), abs(2 * block[1] + 1 - block_cols)))
+        keys = [(rows, cols, mine_count, block_row, block_col) for block_row, block_col in blocks[:self.blocks]]
+        with self._wake:
+            self._wanted += [key for key in keys if key not in self._wanted]
+            self._wake.notify()
+
+    def start(self):
+        self._running = True
+        self._thread = threading.Thread(target=self._fill, name="board-pool", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        with self._wake:
+            self._running = False
+            self._wake.notify()
+        if self._thread:
+            self._thread.join()
+
+    def take(self, rows, cols, mine_count, row, col):
+        """Mine layout for a first click at (row, col); generated on the spot if the pool is empty"""
+        if not poolable(rows, cols, mine_count):
+            return generate_no_guess(rows, cols, mine_count, row, col, int(self.rng.integers(2 ** 63)),
+                                     NO_GUESS_WORKERS)
+        key = (rows, cols, mine_count, row // BLOCK, col // BLOCK)
+        oldest = time.time() - self.max_age
+        with self._wake:
+            queue = self._queues.get(key)
+            while queue:
+                created, packed = queue.popleft()
+                if created >= oldest:
+                    self._wake.notify()  # Refill behind it
+                    return _unpack(packed, rows, cols)
+        return self._generate(key)
+
+    def ready(self, rows, cols, mine_count):
+        """How many layouts are waiting for this board size"""
+        with self._lock:
+            return sum(len(queue) for key, queue in self._queues.items() if key[:3] == (rows, cols, mine_count))
+
+    def _generate(self, key):
+        rows, cols, mine_count, block_row, block_col = key
+        row, col = block_center(rows, cols, block_row, block_col)
+        return generate_no_guess(rows, cols, mine_count, row, col, int(self.rng.integers(2 ** 63)),
+                                 NO_GUESS_WORKERS, safe_radius=POOL_SAFE_RADIUS)
+
+    def _fill(self):
+        """Worker loop: top up the emptiest wanted key, sleep when all are full or the pool is"""
+        while True:
+            with self._wake:
+                while self._running:
+                    short = [key for key in self._wanted if len(self._queues.get(key, ())) < self.per_key]
+                    if short and (self._stored() < self.limit or self._evict()):
+                        break
+                    self._wake.wait()
+                if not self._running:
+                    return
+                key = min(short, key=lambda key: len(self._queues.get(key, ())))
+            packed = np.packbits(self._generate(key).reshape(-1)).tobytes()
+            with self._lock:
+                self._queues.setdefault(key, deque(maxlen=self.per_key)).append((time.time(), packed))
+
+    def _stored(self):
+        return sum(len(queue) for queue in self._queues.values())
+
+    def _evict(self):
+        """Drop the oldest layout of a board no longer warmed; False if there is none. Needs the lock."""
+        wanted = set(self._wanted)
+        spare = [(queue[0][0], key) for key, queue in self._queues.items() if queue and key not in wanted]
+        if not spare:
+            return False
+        _, key = min(spare)
+        self._queues[key].popleft()
+        return True
+
+    def save(self):
+        """Write every layout to the pool file; a write to a temp file then a rename keeps it whole"""
+        with self._lock:
+            records = [(key, created, packed) for key, queue in self._queues.items() for created, packed in queue]
+        temp = self.path + ".tmp"
+        with open(temp, "wb") as file:
+            file.write(_MAGIC)
+            for key, created, packed in records:
+                file.write(_RECORD.pack(*key, created, len(packed)))
+                file.write(packed)
+        os.replace(temp, self.path)
+
+    def load(self):
+        """Read layouts saved by an earlier run, dropping expired ones and any past the limit;
+        a missing or foreign file is ignored"""
+        try:
+            with open(self.path, "rb") as file:
+                data = file.read()
+        except OSError:
+            return
+        if not data.startswith(_MAGIC):
+            return
+        oldest = time.time() - self.max_age
+        offset = len(_MAGIC)
+        with self._lock:
+            while offset + _RECORD.size <= len(data):
+                *key, created, size = _RECORD.unpack_from(data, offset)
+                offset += _RECORD.size
+                packed = data[offset:offset + size]
+                offset += size
+                if created >= oldest and len(packed) == size and self._stored() < self.limit:
+                    self._queues.setdefault(tuple(key), deque(maxlen=self.per_key)).append((created, packed))
+
+
+def _unpack(packed, rows, cols):
+    bits = np.unpackbits(np.frombuffer(packed, dtype=np.uint8), count=rows * cols)
+    return bits.astype(bool).reshape(rows, cols)
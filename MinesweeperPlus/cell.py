@@ -1,61 +1,60 @@
-#cell.py
-# Cell class for individual grid cells
-import pygame
-from constants import *
-
-class Cell:
-    def __init__(self, row, col):
-        self.row = row
-        self.col = col
-        self.is_mine = False
-        self.is_revealed = False
-        self.is_flagged = False
-        self.neighbor_mines = 0
-        self.is_power_up = False
-        self.power_up_type = None
-
-    def draw(self, surface, font_medium, x, y):
-        # Draw cell background
-        if self.is_revealed:
-            pygame.draw.rect(surface, DARK_GRAY, (x, y, CELL_SIZE, CELL_SIZE))
-            pygame.draw.rect(surface, BLACK, (x, y, CELL_SIZE, CELL_SIZE), 1)
-            # Draw mine or number
-            if self.is_mine:
-                pygame.draw.circle(surface, RED, (x + CELL_SIZE // 2, y + CELL_SIZE // 2), 15)
-            elif self.neighbor_mines > 0:
-                colors = {
-                    1: BLUE, 2: GREEN, 3: RED, 4: (0,0,128),
-                    5: (128,0,0), 6: (0,128,128), 7: BLACK, 8: GRAY
-                }
-                color = colors.get(self.neighbor_mines, BLACK)
-                text = font_medium.render(str(self.neighbor_mines), True, color)
-                text_rect = text.get_rect(center=(x + CELL_SIZE // 2, y + CELL_SIZE // 2))
-                surface.blit(text, text_rect)
-        else:
-            pygame.draw.rect(surface, GRAY, (x, y, CELL_SIZE, CELL_SIZE))
-            pygame.draw.rect(surface, BLACK, (x, y, CELL_SIZE, CELL_SIZE), 2)
-
-        # Draw flag if flagged
-        if self.is_flagged:
-            pygame.draw.polygon(surface, RED, [
-                (x + 15, y + 10),
-                (x + 35, y + 20),
-                (x + 15, y + 30)
-            ])
-            pygame.draw.line(surface, BLACK, (x + 15, y + 10), (x + 15, y + 40), 3)
-
-        # Draw power-up icon in the bottom-right corner
-        if self.is_revealed and self.is_power_up:
-            power_up_size = CELL_SIZE // 4  # smaller to avoid blocking number
-            padding = 4
-            center_x = x + CELL_SIZE - power_up_size // 2 - padding
-            center_y = y + CELL_SIZE - power_up_size // 2 - padding
-
-            color_map = {
-                "radar": CYAN,
-                "shield": GOLD,
-                "hint": LIME
-            }
-            color = color_map.get(self.power_up_type, WHITE)
-            pygame.draw.circle(surface, color, (center_x, center_y), power_up_size // 2)
-
+#cell.py
+# Cell view for individual grid cells
+from constants import *
+
+class Cell:
+    """Lightweight view of one board position, stored in BoardState arrays"""
+    __slots__ = ("board", "row", "col")
+
+    def __init__(self, board, row, col):
+        self.board = board
+        self.row = row
+        self.col = col
+
+    @property
+    def is_mine(self):
+        return bool(self.board.mines[self.row, self.col])
+
+    @is_mine.setter
+    def is_mine(self, value):
+        self.board.mines[self.row, self.col] = value
+
+    @property
+    def is_revealed(self):
+        return bool(self.board.revealed[self.row, self.col])
+
+    @is_revealed.setter
+    def is_revealed(self, value):
+        self.board.revealed[self.row, self.col] = value
+
+    @property
+    def is_flagged(self):
+        return bool(self.board.flagged[self.row, self.col])
+
+    @is_flagged.setter
+    def is_flagged(self, value):
+        self.board.flagged[self.row, self.col] = value
+
+    @property
+    def neighbor_mines(self):
+        return int(self.board.neighbors[self.row, self.col])
+
+    @neighbor_mines.setter
+    def neighbor_mines(self, value):
+        self.board.neighbors[self.row, self.col] = value
+
+    @property
+    def is_power_up(self):
+        return bool(self.board.power_ups[self.row, self.col])
+
+    @property
+    def power_up_type(self):
+        return POWER_UP_TYPES[self.board.power_ups[self.row, self.col]]
+
+    @power_up_type.setter
+    def power_up_type(self, value):
+        self.board.power_ups[self.row, self.col] = POWER_UP_TYPES.index(value)
+
+    def draw(self, surface, sprites, x, y):
+        """Draw the cell with one blit from the renderer's SpriteAtlas"""
+        surface.blit(sprites.surfaces[sprites.code(self.board, self.row, self.col)], (x, y))
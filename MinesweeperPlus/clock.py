@@ -0,0 +1,23 @@
+# clock.py
+# Millisecond clocks for the game logic, so it can run without pygame
+import time
+
+class MonotonicClock:
+    """Real time in milliseconds since the clock was created"""
+    def __init__(self):
+        self._start = time.perf_counter()
+
+    def get_ticks(self):
+        return int((time.perf_counter() - self._start) * 1000)
+
+
+class ManualClock:
+    """A clock that only moves when told to, for simulations and replays"""
+    def __init__(self, ticks=0):
+        self.ticks = ticks
+
+    def get_ticks(self):
+        return self.ticks
+
+    def advance(self, ms):
+        self.ticks += ms
@@ -0,0 +1,95 @@
+# config.py
+# Board size, difficulty and scoring for one game, chosen at runtime
+from constants import *
+
+# Screen space the board may use; the HUD needs the margins around it
+BOARD_AREA = (WINDOW_WIDTH - 2 * 200, WINDOW_HEIGHT - 2 * 100)
+MIN_CELL_SIZE = 4
+POWER_UP_DENSITY = POWER_UP_COUNT / (GRID_SIZE * GRID_SIZE)  # 15 on the classic 15x15 board
+
+def safe_area(rows, cols, radius):
+    """Most cells a first click's mine-free square of `radius` can cover on this board"""
+    side = 2 * radius + 1
+    return min(side, rows) * min(side, cols)
+
+
+class GameConfig:
+    """Everything that sizes a game. Defaults are the classic 15x15 board from constants.py.
+    Power-ups scale with the board area unless given, and the cell size shrinks
+    (down to MIN_CELL_SIZE) until the board fits the screen."""
+    def __init__(self, rows=GRID_SIZE, cols=GRID_SIZE, mine_count=MINE_COUNT, power_up_count=None,
+                 time_limit=TIME_LIMIT, cell_size=None, scoring=None, no_guess=NO_GUESS):
+        if rows < 1 or cols < 1 or rows > 65535 or cols > 65535:
+            raise ValueError(f"Board size {rows}x{cols} is out of range")
+        # The first click, and on a no-guess board the square around it, never holds a mine
+        clear = safe_area(rows, cols, max(SAFE_RADIUS, NO_GUESS_RADIUS if no_guess else 0))
+        if not 0 <= mine_count <= rows * cols - clear:
+            raise ValueError(f"A {rows}x{cols} board cannot hold {mine_count} mines" +
+                             (f" and keep {clear} cells around the first click clear" if clear > 1 else ""))
+        self.rows = rows
+        self.cols = cols
+        self.mine_count = mine_count
+        self._auto_power_ups = power_up_count is None
+        if power_up_count is None:
+            power_up_count = round(POWER_UP_DENSITY * rows * cols)
+        self.power_up_count = min(power_up_count, rows * cols - mine_count)
+        self.time_limit = time_limit
+        self._auto_cell_size = cell_size is None
+        if cell_size is None:
+            cell_size = max(min(CELL_SIZE, BOARD_AREA[0] // cols, BOARD_AREA[1] // rows), MIN_CELL_SIZE)
+        self.cell_size = cell_size
+        self.scoring = {**SCORING, **(scoring or {})}
+        self.no_guess = no_guess
+
+    @property
+    def cells(self):
+        return self.rows * self.cols
+
+    def replace(self, **changes):
+        """Copy with some options changed; None leaves an option as it is.
+        A new size without a mine count keeps this config's mine density."""
+        changes = {key: value for key, value in changes.items() if value is not None}
+        options = {
+            "rows": self.rows, "cols": self.cols, "mine_count": self.mine_count,
+            "power_up_count": None if self._auto_power_ups else self.power_up_count,
+            "time_limit": self.time_limit, "cell_size": None if self._auto_cell_size else self.cell_size,
+            "scoring": self.scoring, "no_guess": self.no_guess,
+        }
+        if "mine_count" not in changes and ("rows" in changes or "cols" in changes):
+            cells = changes.get("rows", self.rows) * changes.get("cols", self.cols)
+            changes["mine_count"] = round(self.mine_count * cells / self.cells)
+        if "scoring" in changes:
+            changes["scoring"] = {**self.scoring, **changes["scoring"]}
+        options.update(changes)
+        return GameConfig(**options)
+
+    def __repr__(self):
+        return f"GameConfig({self.rows}x{self.cols}, {self.mine_count} mines, {self.power_up_count} power-ups)"
+
+
+PRESETS = {
+    "classic": GameConfig(),
+    "beginner": GameConfig(9, 9, 10, time_limit=120),
+    "intermediate": GameConfig(16, 16, 40, time_limit=300),
+    "expert": GameConfig(16, 30, 99, time_limit=600),
+    "huge": GameConfig(100, 100, 1600, time_limit=3600),
+}
+
+
+def add_arguments(parser):
+    """Command-line options shared by the game and the simulators"""
+    parser.add_argument("--preset", choices=list(PRESETS), default="classic")
+    parser.add_argument("--rows", type=int)
+    parser.add_argument("--cols", type=int)
+    parser.add_argument("--mines", type=int)
+    parser.add_argument("--power-ups", type=int)
+    parser.add_argument("--time-limit", type=int)
+    parser.add_argument("--no-guess", action="store_true", default=None,
+                        help="only deal boards solvable without guessing")
+
+
+def from_arguments(args, **changes):
+    """GameConfig from parsed add_arguments options"""
+    return PRESETS[args.preset].replace(rows=args.rows, cols=args.cols, mine_count=args.mines,
+                                        power_up_count=args.power_ups, time_limit=args.time_limit,
+                                        no_guess=args.no_guess, **changes)
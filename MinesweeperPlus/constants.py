@@ -1,42 +1,69 @@
-# constants.py
-# Game configuration and constant values
-
-# Window settings
-WINDOW_WIDTH = 1000
-WINDOW_HEIGHT = 800
-
-# Grid settings
-GRID_SIZE = 15
-CELL_SIZE = 40
-MINE_COUNT = 35
-
-# Game timing
-TIME_LIMIT = 180  # seconds
-
-# Radar power-up
-RADAR_RADIUS = 2       # 5x5 area (2 cells in each direction)
-RADAR_DURATION = 3000  # 3 seconds in milliseconds
-RADAR_USES = 3
-
-# Shield power-up
-SHIELD_USES = 2
-SHIELD_DURATION = 5000  # 5 seconds in milliseconds
-
-# Hint power-up
-HINT_USES = 3
-HINT_GLOW_DURATION = 2000  # 2 seconds glow effect
-
-# Colors
-WHITE = (255, 255, 255)
-GRAY = (189, 189, 189)
-DARK_GRAY = (123, 123, 123)
-BLACK = (0, 0, 0)
-RED = (255, 0, 0)
-BLUE = (0, 0, 255)
-GREEN = (0, 200, 0)
-YELLOW = (255, 255, 0)
-CYAN = (0, 255, 255)
-ORANGE = (255, 165, 0)
-PURPLE = (138, 43, 226)
-LIME = (50, 205, 50)
-GOLD = (255, 215, 0)
+# constants.py
+# Game configuration and constant values
+
+# Window settings
+WINDOW_WIDTH = 1000
+WINDOW_HEIGHT = 800
+
+# Grid settings
+GRID_SIZE = 15
+CELL_SIZE = 40
+MINE_COUNT = 35
+PAN_SPEED = 12  # Pixels per frame the board scrolls while an arrow key is held
+FPS = 60  # Frame rate while something animates; otherwise the game sleeps until an event or deadline
+
+SAFE_RADIUS = 0  # 1 also keeps the 3x3 area around the first click mine-free
+NO_GUESS = False  # Only deal boards that can be cleared by deduction from the first click
+NO_GUESS_RADIUS = 1  # No-guess boards keep the 3x3 area around the first click mine-free
+NO_GUESS_WORKERS = 1  # Processes checking no-guess candidates; raise on multi-core machines
+BOARD_POOL_FILE = "board_pool.bin"  # Ready no-guess layouts saved between runs
+BOARD_POOL_SIZE = 2  # Layouts kept ready per board size and first-click block
+BOARD_POOL_BLOCKS = 25  # First-click blocks kept ready per board, the ones nearest the middle
+BOARD_POOL_LIMIT = 100  # Layouts kept in the whole pool, and so in its file
+BOARD_POOL_MAX_AGE = 7 * 24 * 3600  # Seconds before a saved layout is thrown away
+AUTOSAVE_FILE = "savegame.bin"  # Game in progress, saved after every move and on quit
+JOURNAL_FILE = "journal.bin"  # Every action of the current game; the last session's is kept as journal.bin.old
+
+# Power-up types, indexed by the code stored in the board's power-up layer
+POWER_UP_TYPES = (None, "radar", "shield", "hint")
+POWER_UP_COUNT = 15
+
+# Game timing
+TIME_LIMIT = 180  # seconds
+
+# Scoring
+SCORING = {
+    "reveal": 10,        # Base points per revealed cell
+    "combo": 2,          # Extra points per combo step
+    "combo_window": 1000,  # Max ms between reveals to keep a combo going
+    "flag": 20,          # Per correct flag, awarded on a win
+    "time_bonus": 5,     # Per second left on a win
+}
+
+# Radar power-up
+RADAR_RADIUS = 2       # 5x5 area (2 cells in each direction)
+RADAR_DURATION = 3000  # 3 seconds in milliseconds
+RADAR_USES = 3
+
+# Shield power-up
+SHIELD_USES = 2
+SHIELD_DURATION = 5000  # 5 seconds in milliseconds
+
+# Hint power-up
+HINT_USES = 3
+HINT_GLOW_DURATION = 2000  # 2 seconds glow effect
+
+# Colors
+WHITE = (255, 255, 255)
+GRAY = (189, 189, 189)
+DARK_GRAY = (123, 123, 123)
+BLACK = (0, 0, 0)
+RED = (255, 0, 0)
+BLUE = (0, 0, 255)
+GREEN = (0, 200, 0)
+YELLOW = (255, 255, 0)
+CYAN = (0, 255, 255)
+ORANGE = (255, 165, 0)
+PURPLE = (138, 43, 226)
+LIME = (50, 205, 50)
+GOLD = (255, 215, 0)
@@ -0,0 +1,102 @@
+# effects.py
+# Radar, hint glow and shield effects drawn from surfaces allocated once
+import pygame
+from constants import *
+
+class Effects:
+    """Draws the timed power-up effects over the board without allocating per frame"""
+    def __init__(self, renderer):
+        self.renderer = renderer
+        # Radar: the whole (2R+1)x(2R+1) area as one translucent surface with opaque cell borders
+        size = renderer.cell_size
+        area = (2 * RADAR_RADIUS + 1) * size
+        self.radar_area = pygame.Surface((area, area), pygame.SRCALPHA)
+        self.radar_area.fill((*CYAN, 80))
+        for x in range(0, area, size):
+            for y in range(0, area, size):
+                pygame.draw.rect(self.radar_area, CYAN, (x, y, size, size), min(3, size // 4 or 1))
+        # Hint: one glow surface whose alpha is changed as it fades
+        self.hint_glow = pygame.Surface((size, size))
+        self.hint_glow.fill(LIME)
+
+    def draw(self, screen, game):
+        """Draw every active effect and return the rects they cover"""
+        rects = self._draw_hint_glow(screen, game)
+        rects += self._draw_shield_border(screen, game)
+        rects += self._draw_radar_overlay(screen, game)
+        return rects
+
+    def _draw_hint_glow(self, screen, game):
+        """Draw the hint glow effect"""
+        if not game.hint_cell:
+            return []
+        r = self.renderer
+        size = r.cell_size
+        row, col = game.hint_cell
+        x = r.grid_x + col * size
+        y = r.grid_y + row * size
+        if not r.view.rect.colliderect((x, y, size, size)):
+            return []  # Scrolled out of view
+        left = game.scheduler.remaining("hint") or 0
+        self.hint_glow.set_alpha(int(255 * left / HINT_GLOW_DURATION))
+        # A cell half scrolled out must not spill over the HUD
+        screen.set_clip(r.view.rect)
+        rects = [screen.blit(self.hint_glow, (x, y))]
+        pygame.draw.rect(screen, LIME, (x, y, size, size), min(5, size // 4 or 1))
+        screen.set_clip(None)
+        hint_text = r.text.render(r.font_small, "HINT!", LIME)
+        hint_rect = hint_text.get_rect(center=(x + size // 2, y - 15))
+        rects.append(screen.blit(hint_text, hint_rect))
+        return rects
+
+    def _draw_shield_border(self, screen, game):
+        """Draw shield border when active"""
+        if not game.shield_active:
+            return []
+        r = self.renderer
+        time_left = (game.scheduler.remaining("shield") or 0) / 1000
+        if time_left > 3:
+            border_color = GOLD
+        elif time_left > 1:
+            border_color = ORANGE
+        else:
+            border_color = RED
+        grid_rect = r.grid_rect
+        # Only the 5px frame is touched, so report its four edges rather than the whole grid
+        pygame.draw.rect(screen, border_color, grid_rect, 5)
+        rects = [
+            pygame.Rect(grid_rect.left, grid_rect.top, grid_rect.width, 5),
+            pygame.Rect(grid_rect.left, grid_rect.bottom - 5, grid_rect.width, 5),
+            pygame.Rect(grid_rect.left, grid_rect.top, 5, grid_rect.height),
+            pygame.Rect(grid_rect.right - 5, grid_rect.top, 5, grid_rect.height),
+        ]
+        shield_text = r.text.render(r.font_medium, f"SHIELD ACTIVE! {time_left:.1f}s", border_color)
+        shield_rect = shield_text.get_rect(center=(WINDOW_WIDTH // 2, r.view.rect.top - 20))
+        rects.append(screen.blit(shield_text, shield_rect))
+        return rects
+
+    def _draw_radar_overlay(self, screen, game):
+        """Draw radar overlay when active"""
+        if not game.radar_active:
+            return []
+        r = self.renderer
+        size = r.cell_size
+        # One blit of the pre-built area, clipped to the grid near its edges
+        area_rect = self.radar_area.get_rect(topleft=(
+            r.grid_x + (game.radar_center_col - RADAR_RADIUS) * size,
+            r.grid_y + (game.radar_center_row - RADAR_RADIUS) * size))
+        visible = area_rect.clip(r.grid_rect)
+        rects = [screen.blit(self.radar_area, visible, visible.move(-area_rect.x, -area_rect.y))]
+        center_x = r.grid_x + game.radar_center_col * size + size // 2
+        center_y = r.grid_y + game.radar_center_row * size + size // 2
+        if not r.view.rect.collidepoint(center_x, center_y):
+            return rects
+        pygame.draw.circle(screen, ORANGE, (center_x, center_y), 25)
+        rects.append(pygame.draw.circle(screen, BLACK, (center_x, center_y), 25, 2))
+        mine_text = r.text.render(r.font_medium, str(game.radar_mine_count), BLACK)
+        mine_rect = mine_text.get_rect(center=(center_x, center_y))
+        screen.blit(mine_text, mine_rect)
+        time_left = (game.scheduler.remaining("radar") or 0) / 1000
+        radar_timer_text = r.text.render(r.font_small, f"Radar: {time_left:.1f}s", CYAN)
+        rects.append(screen.blit(radar_timer_text, (WINDOW_WIDTH - 180, 15)))
+        return rects
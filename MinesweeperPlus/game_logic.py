@@ -1,273 +1,307 @@
-#game_logic.py
-# Main game logic and state management
-import pygame
-import random
-from constants import *
-from cell import Cell
-
-class Game:
-    def __init__(self):
-        self.grid = [[Cell(row, col) for col in range(GRID_SIZE)] for row in range(GRID_SIZE)]
-        self.game_over = False
-        self.game_won = False
-        self.first_click = True
-        self.start_time = None
-        self.time_remaining = TIME_LIMIT
-        self.flags_placed = 0
-        # Power-up variables
-        self.radar_uses_left = 0  # Start with 0 power-ups for radar
-        self.radar_active = False
-        self.radar_start_time = 0
-        self.radar_center_row = -1
-        self.radar_center_col = -1
-        self.radar_mine_count = 0
-        self.shield_uses_left = 0  # Start with 0 power-ups for shield
-        self.shield_active = False
-        self.shield_start_time = 0
-        self.hint_uses_left = 0  # Start with 0 power-ups for hint
-        self.hint_cell = None
-        self.hint_start_time = 0
-        # Score system
-        self.score = 0
-        self.combo = 0  # Track consecutive correct reveals
-        self.last_reveal_time = 0  # Track time of last reveal for combo timing
-        # Power-up tiles
-        self.power_up_tiles = []  # List to store power-up tile positions and types
-        # Track potential correct flags for scoring
-        self.potential_correct_flags = []
-
-    def place_mines(self, safe_row, safe_col):
-        """Place mines, avoiding the first clicked cell (Basic Minesweeper rule hehe)"""
-        mines_placed = 0
-        while mines_placed < MINE_COUNT:
-            row = random.randint(0, GRID_SIZE - 1)
-            col = random.randint(0, GRID_SIZE - 1)
-            if (row == safe_row and col == safe_col) or self.grid[row][col].is_mine:
-                continue
-            self.grid[row][col].is_mine = True
-            mines_placed += 1
-        # Calculate neighbor mines
-        for row in range(GRID_SIZE):
-            for col in range(GRID_SIZE):
-                if not self.grid[row][col].is_mine:
-                    self.grid[row][col].neighbor_mines = self.count_neighbor_mines(row, col)
-        # Place power-ups after mines are placed
-        self.place_power_ups()
-
-    def place_power_ups(self):
-        """Place power-ups randomly on the grid (ide dari temen)"""
-        power_up_types = ["radar", "shield", "hint"]
-        power_up_count = 15 # Number of power-ups to place
-        for _ in range(power_up_count):
-            row = random.randint(0, GRID_SIZE - 1)
-            col = random.randint(0, GRID_SIZE - 1)
-            # Ensure the tile is not a mine and not already a power-up
-            while self.grid[row][col].is_mine or any(p[0] == (row, col) for p in self.power_up_tiles):
-                row = random.randint(0, GRID_SIZE - 1)
-                col = random.randint(0, GRID_SIZE - 1)
-            power_up_type = random.choice(power_up_types)
-            self.power_up_tiles.append(((row, col), power_up_type))
-            self.grid[row][col].is_power_up = True
-            self.grid[row][col].power_up_type = power_up_type
-
-    def activate_power_up(self, power_up_type):
-        """Activate the power-up based on its type"""
-        if power_up_type == "radar":
-            self.radar_uses_left += 1
-        elif power_up_type == "shield":
-            self.shield_uses_left += 1
-        elif power_up_type == "hint":
-            self.hint_uses_left += 1
-
-    def count_neighbor_mines(self, row, col):
-        """Count mines in the 8 neighboring cells"""
-        count = 0
-        for dr in [-1, 0, 1]:
-            for dc in [-1, 0, 1]:
-                if dr == 0 and dc == 0:
-                    continue
-                new_row, new_col = row + dr, col + dc
-                if 0 <= new_row < GRID_SIZE and 0 <= new_col < GRID_SIZE:
-                    if self.grid[new_row][new_col].is_mine:
-                        count += 1
-        return count
-
-    def activate_radar(self, mouse_x, mouse_y, grid_x, grid_y):
-        """Activate radar scan at mouse position"""
-        if self.radar_uses_left <= 0 or self.first_click or self.game_over or self.game_won:
-            return
-        # Calculate grid position relative to the centered grid
-        adjusted_x = mouse_x - grid_x
-        adjusted_y = mouse_y - grid_y
-        # Ensure adjusted_x and adjusted_y are within the grid bounds
-        if 0 <= adjusted_x < GRID_SIZE * CELL_SIZE and 0 <= adjusted_y < GRID_SIZE * CELL_SIZE:
-            col = adjusted_x // CELL_SIZE
-            row = adjusted_y // CELL_SIZE
-            mine_count = 0
-            for dr in range(-RADAR_RADIUS, RADAR_RADIUS + 1):
-                for dc in range(-RADAR_RADIUS, RADAR_RADIUS + 1):
-                    check_row = row + dr
-                    check_col = col + dc
-                    if 0 <= check_row < GRID_SIZE and 0 <= check_col < GRID_SIZE:
-                        if self.grid[check_row][check_col].is_mine:
-                            mine_count += 1
-            self.radar_active = True
-            self.radar_start_time = pygame.time.get_ticks()
-            self.radar_center_row = row
-            self.radar_center_col = col
-            self.radar_mine_count = mine_count
-            self.radar_uses_left -= 1
-
-    def update_radar(self):
-        """Check if radar should be deactivated"""
-        if self.radar_active:
-            elapsed = pygame.time.get_ticks() - self.radar_start_time
-            if elapsed >= RADAR_DURATION:
-                self.radar_active = False
-
-    def toggle_shield(self):
-        """Activate/deactivate shield"""
-        if self.shield_uses_left > 0 and not self.first_click and not self.game_over and not self.game_won:
-            if not self.shield_active:
-                # Activate shield
-                self.shield_active = True
-                self.shield_start_time = pygame.time.get_ticks()
-            else:
-                # Deactivate manually and subtract usage
-                self.shield_active = False
-                self.shield_uses_left -= 1  # subtract usage immediately
-
-    def update_shield(self):
-        """Check if shield should expire"""
-        if self.shield_active:
-            elapsed = pygame.time.get_ticks() - self.shield_start_time
-            if elapsed >= SHIELD_DURATION:
-                self.shield_active = False
-                if self.shield_uses_left > 0:
-                    self.shield_uses_left -= 1
-
-    def use_hint(self):
-        """Reveal one random safe cell"""
-        if self.hint_uses_left <= 0 or self.first_click or self.game_over or self.game_won:
-            return
-        safe_cells = []
-        for row in range(GRID_SIZE):
-            for col in range(GRID_SIZE):
-                cell = self.grid[row][col]
-                if not cell.is_revealed and not cell.is_mine and not cell.is_flagged:
-                    safe_cells.append((row, col))
-        if safe_cells:
-            row, col = random.choice(safe_cells)
-            self.reveal_cell(row, col)
-            self.hint_cell = (row, col)
-            self.hint_start_time = pygame.time.get_ticks()
-            self.hint_uses_left -= 1
-
-    def update_hint(self):
-        """Check if hint glow should disappear"""
-        if self.hint_cell:
-            elapsed = pygame.time.get_ticks() - self.hint_start_time
-            if elapsed >= HINT_GLOW_DURATION:
-                self.hint_cell = None
-
-    def reveal_cell(self, row, col):
-        """Reveal a cell and cascade if it has no neighboring mines"""
-        if row < 0 or row >= GRID_SIZE or col < 0 or col >= GRID_SIZE:
-            return
-        cell = self.grid[row][col]
-        if cell.is_revealed or cell.is_flagged:
-            return
-        if self.first_click:
-            self.place_mines(row, col)
-            self.first_click = False
-            self.start_time = pygame.time.get_ticks()
-            self.last_reveal_time = pygame.time.get_ticks()
-        cell.is_revealed = True
-        current_time = pygame.time.get_ticks()
-        # Combo logic: Reward faster reveals
-        if current_time - self.last_reveal_time < 1000:  # Less than 1 second between reveals
-            self.combo += 1
-        else:
-            self.combo = 0  # Reset combo if too slow
-        self.last_reveal_time = current_time
-        # Score for revealing a cell
-        self.score += 10 + (self.combo * 2)  # Base + combo bonus
-        # Check if the revealed cell is a power-up tile
-        for power_up_tile in self.power_up_tiles:
-            ((power_row, power_col), power_up_type) = power_up_tile
-            if power_row == row and power_col == col:
-                self.activate_power_up(power_up_type)
-                self.power_up_tiles.remove(power_up_tile)  # Remove the power-up tile
-                break
-        if cell.is_mine:
-            if self.shield_active:
-                self.shield_active = False
-                self.shield_uses_left -= 1
-                return
-            else:
-                self.game_over = True
-                self.reveal_all_mines()
-                return
-        if cell.neighbor_mines == 0:
-            for dr in [-1, 0, 1]:
-                for dc in [-1, 0, 1]:
-                    if dr == 0 and dc == 0:
-                        continue
-                    self.reveal_cell(row + dr, col + dc)
-        self.check_win()
-
-    def reveal_all_mines(self):
-        """Reveal all mines when game is lost"""
-        for row in range(GRID_SIZE):
-            for col in range(GRID_SIZE):
-                if self.grid[row][col].is_mine:
-                    self.grid[row][col].is_revealed = True
-
-    def toggle_flag(self, row, col):
-        """Toggle flag on a cell"""
-        if row < 0 or row >= GRID_SIZE or col < 0 or col >= GRID_SIZE:
-            return
-        cell = self.grid[row][col]
-        if cell.is_revealed:
-            return
-        if cell.is_flagged:
-            cell.is_flagged = False
-            self.flags_placed -= 1
-            # Remove from potential correct flags if it was tracked
-            if (row, col) in self.potential_correct_flags:
-                self.potential_correct_flags.remove((row, col))
-        else:
-            cell.is_flagged = True
-            self.flags_placed += 1
-            # Track potential correct flags (do not award points yet)
-            self.potential_correct_flags.append((row, col))
-
-    def validate_flags(self):
-        """Award points for correctly flagged mines at the end of the game"""
-        for (row, col) in self.potential_correct_flags:
-            if self.grid[row][col].is_mine:
-                self.score += 20  # Award points only after validation
-
-    def check_win(self):
-        """Check if all non-mine cells are revealed"""
-        for row in range(GRID_SIZE):
-            for col in range(GRID_SIZE):
-                cell = self.grid[row][col]
-                if not cell.is_mine and not cell.is_revealed:
-                    return
-        self.game_won = True
-        self.validate_flags()  # Award points for correct flags only now
-        # Time bonus: More points for finishing faster
-        time_bonus = self.time_remaining * 5  # 5 points per second remaining
-        self.score += time_bonus
-
-    def update_timer(self):
-        """Update the countdown timer"""
-        if self.first_click or self.game_over or self.game_won:
-            return
-        elapsed = (pygame.time.get_ticks() - self.start_time) // 1000
-        self.time_remaining = TIME_LIMIT - elapsed
-        if self.time_remaining <= 0:
-            self.time_remaining = 0
-            self.game_over = True
-            self.reveal_all_mines()
+#game_logic.py
+# Main game logic and state management
+import functools
+import numpy as np
+from constants import *
+from config import GameConfig
+from board import BoardState
+from clock import MonotonicClock
+from scheduler import Scheduler
+from solver import Solver
+from probability import ProbabilityMap
+from generator import generate_no_guess
+from profiler import timed
+
+def action(method):
+    """Run a Game method at one clock reading, after the timers due by then have
+    fired, so it sees the same time throughout and a replay at that reading matches"""
+    @functools.wraps(method)
+    def wrapper(self, *args):
+        with self.scheduler.pinned():
+            self.scheduler.run()
+            return method(self, *args)
+    return wrapper
+
+
+class Game:
+    def __init__(self, config=None, seed=None, clock=None, board_pool=None):
+        # Board size, mines, power-ups, time limit and scoring; the classic board by default
+        self.config = config = config or GameConfig()
+        # All randomness comes from one seedable generator so games can be reproduced
+        self.seed = seed
+        self.rng = np.random.default_rng(seed)
+        # Anything with get_ticks() in milliseconds; simulations pass a ManualClock
+        self.clock = clock or MonotonicClock()
+        # Countdown, effects and combo window run on named timers in game time, which stops while paused
+        self.scheduler = Scheduler(self.clock)
+        self.timer_callbacks = {
+            "countdown": self._countdown_tick,
+            "radar": self._radar_expired,
+            "shield": self._shield_expired,
+            "hint": self._hint_faded,
+            "combo": self._combo_expired,
+        }
+        self.mine_count = config.mine_count
+        self.power_up_count = config.power_up_count
+        self.time_limit = config.time_limit
+        self.scoring = config.scoring
+        self.no_guess = config.no_guess
+        self.board_pool = board_pool  # Ready no-guess layouts; without one they are generated on the first click
+        self.board = BoardState(config.rows, config.cols)
+        self.grid = self.board  # grid[row][col] still yields Cell views
+        self.solver = Solver(self.board)  # Deduces certain cells from what the player can see
+        # Mine odds for every hidden cell; sampling has its own generator so it never shifts the game's draws
+        self.probabilities = ProbabilityMap(self.board, config.mine_count, rng=np.random.default_rng(seed))
+        self.game_over = False
+        self.game_won = False
+        self.first_click = True
+        self.start_time = None  # Game time of the first click
+        self.time_remaining = config.time_limit
+        self.flags_placed = 0
+        # Running counters so win checks and end-of-game scoring are O(1)
+        self.safe_cells_left = config.cells - config.mine_count
+        self.correct_flags = 0  # Flags sitting on mines (do not award points yet)
+        # Power-up variables
+        self.radar_uses_left = 0  # Start with 0 power-ups for radar
+        self.radar_active = False
+        self.radar_center_row = -1
+        self.radar_center_col = -1
+        self.radar_mine_count = 0
+        self.shield_uses_left = 0  # Start with 0 power-ups for shield
+        self.shield_active = False
+        self.hint_uses_left = 0  # Start with 0 power-ups for hint
+        self.hint_cell = None
+        # Score system
+        self.score = 0
+        self.combo = 0  # Track consecutive correct reveals
+        # Power-up tiles
+        self.power_up_tiles = {}  # Uncollected power-ups keyed by (row, col)
+
+    @timed("place_mines")
+    def place_mines(self, safe_row, safe_col):
+        """Place mines, avoiding the first clicked cell (Basic Minesweeper rule hehe)"""
+        if self.no_guess and self.board_pool:
+            board = self.board
+            board.mines[:] = self.board_pool.take(board.rows, board.cols, self.mine_count, safe_row, safe_col)
+            board.compute_neighbors()
+        elif self.no_guess:
+            board = self.board
+            board.mines[:] = generate_no_guess(board.rows, board.cols, self.mine_count, safe_row, safe_col,
+                                         int(self.rng.integers(2 ** 63)), NO_GUESS_WORKERS)
+            board.compute_neighbors()
+        else:
+            self.board.place_mines(self.mine_count, self.rng, safe_row, safe_col, SAFE_RADIUS)
+        # Flags may have been placed before the mines existed
+        self.correct_flags = int((self.board.flagged & self.board.mines).sum())
+        # Place power-ups after mines are placed
+        self.place_power_ups()
+
+    def place_power_ups(self):
+        """Place power-ups randomly on the grid (ide dari temen)"""
+        picks, codes = self.board.place_power_ups(self.power_up_count, self.rng)
+        for index, code in zip(picks.tolist(), codes.tolist()):
+            self.power_up_tiles[divmod(index, self.board.cols)] = POWER_UP_TYPES[code]
+
+    def activate_power_up(self, power_up_type):
+        """Activate the power-up based on its type"""
+        if power_up_type == "radar":
+            self.radar_uses_left += 1
+        elif power_up_type == "shield":
+            self.shield_uses_left += 1
+        elif power_up_type == "hint":
+            self.hint_uses_left += 1
+
+    def count_neighbor_mines(self, row, col):
+        """Count mines in the 8 neighboring cells"""
+        area = self.board.mines[max(row - 1, 0):row + 2, max(col - 1, 0):col + 2]
+        return int(area.sum()) - int(self.board.mines[row, col])
+
+    @action
+    def radar_at(self, row, col):
+        """Activate radar scan centered on a cell"""
+        if self.radar_uses_left <= 0 or self.first_click or self.game_over or self.game_won:
+            return
+        if not self.board.in_bounds(row, col):
+            return
+        mine_count = int(self.board.mines[max(row - RADAR_RADIUS, 0):row + RADAR_RADIUS + 1,
+                                          max(col - RADAR_RADIUS, 0):col + RADAR_RADIUS + 1].sum())
+        self.radar_active = True
+        self.start_timer("radar", RADAR_DURATION)
+        self.radar_center_row = row
+        self.radar_center_col = col
+        self.radar_mine_count = mine_count
+        self.radar_uses_left -= 1
+
+    def _radar_expired(self):
+        self.radar_active = False
+
+    @action
+    def toggle_shield(self):
+        """Activate/deactivate shield"""
+        if self.shield_uses_left > 0 and not self.first_click and not self.game_over and not self.game_won:
+            if not self.shield_active:
+                # Activate shield
+                self.shield_active = True
+                self.start_timer("shield", SHIELD_DURATION)
+            else:
+                # Deactivate manually and subtract usage
+                self.shield_active = False
+                self.scheduler.cancel("shield")
+                self.shield_uses_left -= 1  # subtract usage immediately
+
+    def _shield_expired(self):
+        self.shield_active = False
+        if self.shield_uses_left > 0:
+            self.shield_uses_left -= 1
+
+    @action
+    def use_hint(self):
+        """Reveal a safe cell, preferring one the player could have deduced"""
+        if self.hint_uses_left <= 0 or self.first_click or self.game_over or self.game_won:
+            return
+        board = self.board
+        safe, _ = self.solver.solve()
+        safe_cells = np.array(sorted(safe), dtype=np.intp)
+        # Deductions never touch mines, but a hint must not be the thing that kills
+        safe_cells = safe_cells[~(board.mines.reshape(-1)[safe_cells] | board.flagged.reshape(-1)[safe_cells])]
+        if not safe_cells.size:
+            # Nothing is certain yet; fall back to any safe cell
+            safe_cells = np.flatnonzero(~(board.revealed | board.mines | board.flagged))
+        if safe_cells.size:
+            row, col = divmod(int(self.rng.choice(safe_cells)), board.cols)
+            self.reveal_cell(row, col)
+            self.hint_cell = (row, col)
+            self.start_timer("hint", HINT_GLOW_DURATION)
+            self.hint_uses_left -= 1
+
+    def _hint_faded(self):
+        self.hint_cell = None
+
+    @timed("reveal_cell")
+    @action
+    def reveal_cell(self, row, col):
+        """Reveal a cell and cascade if it has no neighboring mines.
+        Returns the flat indices of the newly revealed cells."""
+        board = self.board
+        if self.game_over or self.game_won:
+            return np.empty(0, dtype=np.intp)
+        if not board.in_bounds(row, col) or board.revealed[row, col] or board.flagged[row, col]:
+            return np.empty(0, dtype=np.intp)
+        if self.first_click:
+            self.place_mines(row, col)
+            self.first_click = False
+            self.start_time = self.now()
+            self.start_timer("countdown", 1000)
+            self.start_timer("combo", self.scoring["combo_window"])
+        revealed = board.flood_reveal(row, col)
+        self.solver.notify(revealed)
+        count = len(revealed)
+        scoring = self.scoring
+        # Combo logic: Reward faster reveals
+        if self.scheduler.remaining("combo"):  # Quick follow-up reveal
+            self.combo += 1
+        else:
+            self.combo = 0  # Reset combo if too slow
+        self.start_timer("combo", scoring["combo_window"])
+        # Score for revealing a cell: Base + combo bonus, and every further cell in a
+        # cascade is an instant reveal, so the combo climbs by one per cell
+        self.score += (count * (scoring["reveal"] + self.combo * scoring["combo"]) +
+                       scoring["combo"] * count * (count - 1) // 2)
+        self.combo += count - 1
+        # Every revealed cell is safe, except a clicked mine
+        self.safe_cells_left -= count - int(board.mines[row, col])
+        # Collect any power-up tiles uncovered by this reveal
+        for index in revealed[board.power_ups.reshape(-1)[revealed] != 0]:
+            power_up_type = self.power_up_tiles.pop(divmod(int(index), board.cols), None)
+            if power_up_type:
+                self.activate_power_up(power_up_type)
+        if board.mines[row, col]:
+            if self.shield_active:
+                self.shield_active = False
+                self.scheduler.cancel("shield")
+                self.shield_uses_left -= 1
+            else:
+                self.game_over = True
+                self.reveal_all_mines()
+            return revealed
+        self.check_win()
+        return revealed
+
+    def reveal_all_mines(self):
+        """Reveal all mines when game is lost (mines never count as safe cells or
+        change flags, so the counters stay as they are)"""
+        self.board.reveal_mines()
+
+    @action
+    def toggle_flag(self, row, col):
+        """Toggle flag on a cell"""
+        board = self.board
+        if not board.in_bounds(row, col) or board.revealed[row, col]:
+            return
+        if board.flagged[row, col]:
+            board.set_flag(row, col, False)
+            self.flags_placed -= 1
+            self.correct_flags -= int(board.mines[row, col])
+        else:
+            board.set_flag(row, col, True)
+            self.flags_placed += 1
+            self.correct_flags += int(board.mines[row, col])
+
+    def validate_flags(self):
+        """Award points for correctly flagged mines at the end of the game"""
+        self.score += self.scoring["flag"] * self.correct_flags  # Award points only after validation
+
+    def check_win(self):
+        """Check if all non-mine cells are revealed"""
+        if self.safe_cells_left > 0:
+            return
+        self.game_won = True
+        self.validate_flags()  # Award points for correct flags only now
+        # Time bonus: More points for finishing faster
+        time_bonus = self.time_remaining * self.scoring["time_bonus"]  # Points per second remaining
+        self.score += time_bonus
+
+    def _countdown_tick(self):
+        """Once a second of game time: update the countdown and end the game at zero"""
+        if self.game_over or self.game_won:
+            return
+        elapsed = self.now() - self.start_time
+        self.time_remaining = self.time_limit - elapsed // 1000
+        if self.time_remaining <= 0:
+            self.time_remaining = 0
+            self.game_over = True
+            self.reveal_all_mines()
+            return
+        self.start_timer("countdown", 1000 - elapsed % 1000)
+
+    def _combo_expired(self):
+        self.combo = 0
+
+    def start_timer(self, name, delay):
+        """Run one of the named timers `delay` ms of game time from now"""
+        self.scheduler.schedule(name, delay, self.timer_callbacks[name])
+
+    def now(self):
+        """Game time in ms: the clock without the time spent paused"""
+        return self.scheduler.now()
+
+    @action
+    def pause(self):
+        """Stop the countdown and every timed effect until resume()"""
+        self.scheduler.pause()
+
+    @action
+    def resume(self):
+        self.scheduler.resume()
+
+    def update(self):
+        """Fire the timers that are due. The main loop calls this every frame, and
+        every action calls it first, so an action sees the same state whether it
+        runs live or in a replay"""
+        self.scheduler.run()
+
+    def next_deadline(self):
+        """Game time of the next change that happens without input: the countdown's
+        next second, or a radar, shield, hint glow or combo running out.
+        None if nothing is timed, or while paused"""
+        return self.scheduler.next_deadline()
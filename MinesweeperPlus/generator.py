@@ -0,0 +1,88 @@
+# generator.py
+# No-guess board generation: draws candidate layouts around the first click and
+# keeps the first one the solver can clear without guessing
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from constants import *
+from board import BoardState
+from solver import Solver
+
+_pool = None  # Worker processes, started on first parallel use and kept for later boards
+_pool_lock = threading.Lock()  # The board pool's thread and the game thread may both start it
+
+def candidate(rows, cols, mine_count, safe_row, safe_col, safe_radius, seed):
+    """Candidate layout number `seed`, mine-free within safe_radius (at least 1) of the first click"""
+    board = BoardState(rows, cols)
+    board.place_mines(mine_count, np.random.default_rng(seed), safe_row, safe_col, safe_radius)
+    return board.mines
+
+
+def solvable(mines, safe_row, safe_col):
+    """Whether the solver clears the board from the first click by deduction alone"""
+    board = BoardState(*mines.shape)
+    board.mines[:] = mines
+    board.compute_neighbors()
+    solver = Solver(board)
+    solver.notify(board.flood_reveal(safe_row, safe_col))
+    while True:
+        safe, _ = solver.solve()
+        if not safe:
+            break
+        for index in list(safe):
+            if not board.revealed.flat[index]:
+                solver.notify(board.flood_reveal(*divmod(index, board.cols)))
+    return int(board.revealed.sum()) + int(mines.sum()) == mines.size
+
+
+def check_batch(rows, cols, mine_count, safe_row, safe_col, safe_radius, seeds):
+    """Worker entry point: the first seed whose candidate is solvable, or None"""
+    for seed in seeds:
+        if solvable(candidate(rows, cols, mine_count, safe_row, safe_col, safe_radius, seed), safe_row, safe_col):
+            return seed
+    return None
+
+
+def generate_no_guess(rows, cols, mine_count, safe_row, safe_col, seed, workers=1, safe_radius=NO_GUESS_RADIUS,
+                      batch_size=8, max_candidates=1000):
+    """Mine layout for a no-guess game, as a boolean array.
+    The first click always opens a zero, since guessing is over once it does.
+    Candidates are numbered (seed, 0), (seed, 1), ... and checked in batches,
+    on `workers` processes when above 1. The lowest-numbered solvable candidate
+    wins whatever the worker count, so a seed always gives the same board.
+    If none of `max_candidates` is solvable, the last candidate is used."""
+    batches = ([(seed, i) for i in range(start, min(start + batch_size, max_candidates))]
+               for start in range(0, max_candidates, batch_size))
+    args = (rows, cols, mine_count, safe_row, safe_col, safe_radius)
+    if workers > 1:
+        found = _check_parallel(args, batches, workers)
+    else:
+        found = next((found for found in (check_batch(*args, seeds) for seeds in batches) if found), None)
+    return candidate(*args, found or (seed, max_candidates - 1))
+
+
+def _check_parallel(args, batches, workers):
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=workers)
+    running = deque()
+    try:
+        for seeds in batches:
+            running.append(_pool.submit(check_batch, *args, seeds))
+            if len(running) < workers * 2:
+                continue
+            # Results are taken in submission order so the earliest solvable candidate wins
+            found = running.popleft().result()
+            if found:
+                return found
+        while running:
+            found = running.popleft().result()
+            if found:
+                return found
+        return None
+    finally:
+        for future in running:
+            future.cancel()
+
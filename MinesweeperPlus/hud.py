@@ -0,0 +1,107 @@
+# hud.py
+# Cached text surfaces and the score/stat/power-up HUD
+from collections import OrderedDict
+import pygame
+from constants import *
+
+class TextCache:
+    """Bounded LRU of rendered text keyed by (font, text, color)"""
+    def __init__(self, max_size=256):
+        self.max_size = max_size
+        self._surfaces = OrderedDict()
+
+    def render(self, font, text, color):
+        key = (font, text, color)
+        surface = self._surfaces.get(key)
+        if surface is None:
+            surface = font.render(text, True, color)
+            self._surfaces[key] = surface
+            if len(self._surfaces) > self.max_size:
+                self._surfaces.popitem(last=False)  # Drop the least recently used
+        else:
+            self._surfaces.move_to_end(key)
+        return surface
+
+
+class Hud:
+    """Draws the HUD onto the renderer's layer, only where a Game field changed"""
+    def __init__(self, renderer):
+        self.renderer = renderer
+        self.text = renderer.text
+        self._fields = None  # Game fields the HUD was last drawn from
+        self._drawn = {}  # Item name -> (drawn state, rect on the layer)
+
+    def reset(self):
+        """Forget what is on the layer, so everything is drawn again"""
+        self._fields = None
+        self._drawn = {}
+
+    def _items(self, game):
+        """Score, stats and power-up status as (name, font, text, color, position)"""
+        r = self.renderer
+        view = r.view.rect
+        side_x = view.right + 25  # Power-up texts right of the grid
+        radar_color = CYAN if game.radar_uses_left > 0 else GRAY
+        shield_color = GOLD if game.shield_uses_left > 0 else GRAY
+        hint_color = LIME if game.hint_uses_left > 0 else GRAY
+        return [
+            ("score", r.font_medium, f"Score: {game.score}", GOLD, (20, 20)),
+            ("timer", r.font_medium, f"Time: {game.time_remaining}s", BLACK, (20, WINDOW_HEIGHT - 50)),
+            ("mines", r.font_medium, f"Mines: {game.mine_count}", BLACK, (200, WINDOW_HEIGHT - 50)),
+            ("flags", r.font_medium, f"Flags: {game.flags_placed}/{game.mine_count}", BLACK, (380, WINDOW_HEIGHT - 50)),
+            ("radar", r.font_small, f"[R] Radar: {game.radar_uses_left}", radar_color, (side_x, view.top + 20)),
+            ("shield", r.font_small, f"[S] Shield: {game.shield_uses_left}", shield_color, (side_x, view.top + 50)),
+            ("hint", r.font_small, f"[H] Hint: {game.hint_uses_left}", hint_color, (side_x, view.top + 80)),
+        ]
+
+    def draw(self, layer, game):
+        """Re-render changed HUD items on the layer and return the affected rects"""
+        fields = (game.score, game.time_remaining, game.flags_placed, game.radar_uses_left,
+                  game.shield_uses_left, game.hint_uses_left, game.shield_active)
+        if fields == self._fields:
+            return []
+        self._fields = fields
+        rects = []
+        for name, font, text, color, pos in self._items(game):
+            drawn = self._drawn.get(name)
+            if drawn and drawn[0] == (text, color):
+                continue
+            if drawn:
+                layer.fill(DARK_GRAY, drawn[1])
+                rects.append(drawn[1])
+            rect = layer.blit(self.text.render(font, text, color), pos)
+            self._drawn[name] = ((text, color), rect)
+            rects.append(rect)
+        # Draw shield icon to the right of the shield text
+        drawn = self._drawn.get("shield_icon")
+        if not drawn or drawn[0] != game.shield_active:
+            shield_icon_x = self.renderer.view.rect.right + 12
+            shield_icon_y = self.renderer.view.rect.top + 50
+            rect = self.renderer.draw_shield_icon(layer, shield_icon_x, shield_icon_y, 15, game.shield_active)
+            self._drawn["shield_icon"] = (game.shield_active, rect)
+            rects.append(rect)
+        return rects
+
+
+class ProfilerOverlay:
+    """Rolling p50/p99 of every profiler section in a panel at the top right,
+    refreshed a few times a second so reading it stays cheap"""
+    def __init__(self, profiler, refresh_ms=250):
+        self.profiler = profiler
+        self.refresh_ms = refresh_ms
+        self.font = pygame.font.SysFont("monospace", 14)  # Fixed width keeps the columns lined up
+        self.image = None
+        self._refreshed = None
+
+    def draw(self, screen, now):
+        """Draw the panel over the screen and return its rect"""
+        if self.image is None or now - self._refreshed >= self.refresh_ms:
+            self._refreshed = now
+            lines = [f"{'section':<14}{'p50':>8}{'p99':>8}"] + [
+                f"{name:<14}{p50:>8.2f}{p99:>8.2f}" for name, p50, p99, _ in self.profiler.percentiles()]
+            width = max(self.font.size(line)[0] for line in lines) + 16
+            self.image = pygame.Surface((width, len(lines) * 16 + 12))
+            self.image.fill(BLACK)
+            for i, line in enumerate(lines):
+                self.image.blit(self.font.render(line, True, LIME if i else WHITE), (8, 6 + i * 16))
+        return screen.blit(self.image, (WINDOW_WIDTH - self.image.get_width() - 10, 10))
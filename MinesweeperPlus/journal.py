@@ -0,0 +1,188 @@
+# journal.py
+# Append-only log of a game's actions, and a headless replay that re-runs it on a manual clock
+import argparse
+import struct
+import time
+import zlib
+import numpy as np
+from clock import ManualClock
+from savegame import snapshot, restore
+
+_MAGIC = b"MSJRNL"
+VERSION = 2
+# magic, version, seed (-1 if unknown), then the game clock (ms) and snapshot size at the start
+_HEADER = struct.Struct("<6sHqII")
+_RECORD = struct.Struct("<IBHH")  # game clock (ms), action, row, col
+_END = struct.Struct("<qI")  # score, state digest
+# Actions
+REVEAL, FLAG, RADAR, SHIELD, HINT, PAUSE, RESUME, LAYOUT, END = range(1, 10)
+
+def digest(game):
+    """Checksum of the board layers and counters, to tell whether two runs ended alike"""
+    board = game.board
+    checksum = zlib.crc32(np.packbits(board.revealed).tobytes())
+    checksum = zlib.crc32(np.packbits(board.flagged).tobytes(), checksum)
+    counters = (game.score, game.combo, game.flags_placed, game.safe_cells_left, game.time_remaining,
+                game.radar_uses_left, game.shield_uses_left, game.hint_uses_left, game.game_over, game.game_won)
+    return zlib.crc32(struct.pack("<10q", *counters), checksum)
+
+
+class Journal:
+    """Records one game to a file while it is played. The header holds the game's
+    seed and a snapshot of it at the start (config, RNG state and board), so a
+    replay also works for a game picked up from a save. Every action is then one
+    9-byte record, flushed as it happens so the log survives a crash. Use the
+    methods here in place of the Game methods of the same action."""
+    def __init__(self, path, game):
+        self.game = game
+        start = snapshot(game)
+        self.file = open(path, "wb")
+        self.file.write(_HEADER.pack(_MAGIC, VERSION, -1 if game.seed is None else game.seed,
+                                      game.clock.get_ticks(), len(start)))
+        self.file.write(start)
+        self.file.flush()
+
+    def record(self, action, row=0, col=0, payload=b""):
+        # Stamped with the reading the action ran at, so the replay runs it at the same time
+        self.file.write(_RECORD.pack(self.game.scheduler.ticks(), action, row, col) + payload)
+        self.file.flush()
+
+    def reveal(self, row, col):
+        game = self.game
+        with game.scheduler.pinned():
+            first_click = game.first_click
+            revealed = game.reveal_cell(row, col)
+            if first_click and not game.first_click and game.no_guess and game.board_pool:
+                # A pooled no-guess layout does not come from the game's generator,
+                # so the layout itself goes in the log, ahead of the click that used it
+                self.record(LAYOUT, payload=np.packbits(game.board.mines).tobytes())
+            self.record(REVEAL, row, col)
+        return revealed
+
+    def flag(self, row, col):
+        with self.game.scheduler.pinned():
+            self.game.toggle_flag(row, col)
+            self.record(FLAG, row, col)
+
+    def radar(self, row, col):
+        with self.game.scheduler.pinned():
+            self.game.radar_at(row, col)
+            self.record(RADAR, row, col)
+
+    def shield(self):
+        with self.game.scheduler.pinned():
+            self.game.toggle_shield()
+            self.record(SHIELD)
+
+    def hint(self):
+        with self.game.scheduler.pinned():
+            self.game.use_hint()
+            self.record(HINT)
+
+    def pause(self):
+        with self.game.scheduler.pinned():
+            self.game.pause()
+            self.record(PAUSE)
+
+    def resume(self):
+        with self.game.scheduler.pinned():
+            self.game.resume()
+            self.record(RESUME)
+
+    def close(self):
+        """Finish the log with the final score and state digest"""
+        if self.file.closed:
+            return
+        with self.game.scheduler.pinned():
+            self.game.update()
+            self.record(END, payload=_END.pack(self.game.score, digest(self.game)))
+        self.file.close()
+
+
+class _Layout:
+    """Stands in for a board pool during replay, handing out the logged layout"""
+    def __init__(self, mines):
+        self.mines = mines
+
+    def take(self, rows, cols, mine_count, row, col):
+        return self.mines
+
+
+def _records(file, layout_size):
+    """(clock ms, action, row, col, payload) for each record after the header,
+    read one at a time so a journal of any length streams in constant memory"""
+    while True:
+        record = file.read(_RECORD.size)
+        if len(record) < _RECORD.size:
+            return  # The end, or a record cut off by a crash
+        ticks, action, row, col = _RECORD.unpack(record)
+        payload = b""
+        if action == END:
+            payload = file.read(_END.size)
+        elif action == LAYOUT:
+            payload = file.read(layout_size)
+        yield ticks, action, row, col, payload
+
+
+def replay(path):
+    """Re-run a journal on a manual clock and return the game it ends with.
+    Raises ValueError if the file is not a journal, or if the replayed game ends
+    with a different score or state than the one recorded. A journal without an
+    END record (a crashed session) replays up to its last action."""
+    with open(path, "rb") as file:
+        header = file.read(_HEADER.size)
+        if len(header) < _HEADER.size:
+            raise ValueError("Not a Minesweeper+ journal")
+        magic, version, seed, ticks, size = _HEADER.unpack(header)
+        if magic != _MAGIC:
+            raise ValueError("Not a Minesweeper+ journal")
+        if version != VERSION:
+            raise ValueError(f"Journal version {version} is not supported")
+        clock = ManualClock(ticks)
+        game = restore(file.read(size), clock)
+        game.seed = None if seed < 0 else seed
+        shape = game.board.mines.shape
+        for ticks, action, row, col, payload in _records(file, (game.board.mines.size + 7) // 8):
+            clock.ticks = ticks
+            if action == REVEAL:
+                game.reveal_cell(row, col)
+            elif action == FLAG:
+                game.toggle_flag(row, col)
+            elif action == RADAR:
+                game.radar_at(row, col)
+            elif action == SHIELD:
+                game.toggle_shield()
+            elif action == HINT:
+                game.use_hint()
+            elif action == PAUSE:
+                game.pause()
+            elif action == RESUME:
+                game.resume()
+            elif action == LAYOUT:
+                mines = np.unpackbits(np.frombuffer(payload, dtype=np.uint8), count=game.board.mines.size)
+                game.board_pool = _Layout(mines.astype(bool).reshape(shape))
+            elif action == END:
+                game.update()
+                score, recorded = _END.unpack(payload)
+                if (game.score, digest(game)) != (score, recorded):
+                    raise ValueError(f"Replay diverged: score {game.score} (digest {digest(game):08x}), "
+                                     f"recorded {score} (digest {recorded:08x})")
+        return game
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay Minesweeper+ journals and check they end as recorded")
+    parser.add_argument("journals", nargs="+")
+    args = parser.parse_args()
+    for path in args.journals:
+        started = time.perf_counter()
+        game = replay(path)
+        wall_time = time.perf_counter() - started
+        played = game.clock.get_ticks() / 1000
+        outcome = "won" if game.game_won else "lost" if game.game_over else "unfinished"
+        print(f"{path}: {outcome}, score {game.score}, {played:.1f} s of play replayed in {wall_time * 1000:.1f} ms"
+              f" ({played / max(wall_time, 1e-9):,.0f}x real time)")
+
+
+if __name__ == "__main__":
+    main()
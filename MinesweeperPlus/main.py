@@ -1,118 +1,219 @@
-# main.py
-# Entry point and main game loop
-import pygame
-import sys
-from constants import *
-from game_logic import Game
-from renderer import Renderer
-from menu import draw_main_menu, draw_pause_menu
-from how_to_play import how_to_play_screen
-
-def main():
-    pygame.init()
-    # Create window
-    screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
-    pygame.display.set_caption("Minesweeper+")
-    clock = pygame.time.Clock()
-    # Initialize game and renderer
-    game = Game()
-    renderer = Renderer(screen)
-    # Game state control
-    game_state = "menu"  # "menu", "gameplay", "tutorial", "paused"
-    running = True
-    while running:
-        clock.tick(60)
-        mouse_pos = pygame.mouse.get_pos()
-        # === Handle events ===
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                running = False
-            # --- MENU STATE ---
-            elif game_state == "menu":
-                if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-                    buttons = [
-                        {"text": "Start Game", "y": 300},
-                        {"text": "How to Play", "y": 400},
-                        {"text": "Quit", "y": 500},
-                    ]
-                    for b in buttons:
-                        rect = pygame.Rect(WINDOW_WIDTH // 2 - 150, b["y"], 300, 60)
-                        if rect.collidepoint(mouse_pos):
-                            if b["text"] == "Start Game":
-                                game = Game()  # reset game
-                                game_state = "gameplay"
-                            elif b["text"] == "How to Play":
-                                game_state = "tutorial"
-                            elif b["text"] == "Quit":
-                                running = False
-            # --- GAMEPLAY STATE ---
-            elif game_state == "gameplay":
-                if event.type == pygame.MOUSEBUTTONDOWN:
-                    if not game.game_over and not game.game_won:
-                        mouse_x, mouse_y = pygame.mouse.get_pos()
-                        grid_x = mouse_x - renderer.grid_x
-                        grid_y = mouse_y - renderer.grid_y
-                        if 0 <= grid_x < GRID_SIZE * CELL_SIZE and 0 <= grid_y < GRID_SIZE * CELL_SIZE:
-                            col = grid_x // CELL_SIZE
-                            row = grid_y // CELL_SIZE
-                            if event.button == 1:  # Left click
-                                game.reveal_cell(row, col)
-                            elif event.button == 3:  # Right click
-                                game.toggle_flag(row, col)
-                elif event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_SPACE:
-                        if game.game_over or game.game_won:
-                            game = Game()  # Restart
-                    elif event.key == pygame.K_r:
-                        if not game.game_over and not game.game_won:
-                            mouse_x, mouse_y = pygame.mouse.get_pos()
-                            game.activate_radar(mouse_x, mouse_y, renderer.grid_x, renderer.grid_y)
-                    elif event.key == pygame.K_s:
-                        game.toggle_shield()
-                    elif event.key == pygame.K_h:
-                        game.use_hint()
-                    elif event.key == pygame.K_ESCAPE:
-                        game_state = "menu"  # Return to menu anytime
-                    elif event.key == pygame.K_p:
-                        game_state = "paused"  # Pause the game
-            # --- PAUSED STATE ---
-            elif game_state == "paused":
-                if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-                    buttons = draw_pause_menu(screen)
-                    for b in buttons:
-                        rect = pygame.Rect(WINDOW_WIDTH // 2 - 150, b["y"], 300, 60)
-                        if rect.collidepoint(mouse_pos):
-                            if b["text"] == "Resume":
-                                game_state = "gameplay"
-                            elif b["text"] == "Restart":
-                                game = Game()  # Reset game
-                                game_state = "gameplay"
-                            elif b["text"] == "Main Menu":
-                                game_state = "menu"
-            # --- TUTORIAL STATE ---
-            elif game_state == "tutorial":
-                if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
-                    game_state = "menu"
-
-        # === DRAW ===
-        if game_state == "menu":
-            draw_main_menu(screen)
-        elif game_state == "gameplay":
-            game.update_timer()
-            game.update_radar()
-            game.update_shield()
-            game.update_hint()
-            renderer.draw_game(game)
-        elif game_state == "paused":
-            draw_pause_menu(screen)
-        elif game_state == "tutorial":
-            how_to_play_screen(screen, clock)
-            game_state = "menu"  # Return to menu after tutorial
-
-        pygame.display.flip()
-
-    pygame.quit()
-    sys.exit()
-
-if __name__ == "__main__":
-    main()
+# main.py
+# Entry point and main game loop
+import argparse
+import os
+import random
+import pygame
+import sys
+from constants import *
+from config import add_arguments, from_arguments
+from game_logic import Game
+from renderer import Renderer
+from menu import main_menu, pause_menu
+from how_to_play import HowToPlayScreen
+from board_pool import BoardPool
+from savegame import save, load, discard
+from journal import Journal
+from profiler import profiler
+from hud import ProfilerOverlay
+
+def in_progress(game):
+    """Whether a game has moves worth keeping"""
+    return not (game.first_click or game.game_over or game.game_won)
+
+
+def autosave(game):
+    """Keep the save file in step with the game: rewritten while it is in progress, removed once it is over"""
+    if in_progress(game):
+        save(game, AUTOSAVE_FILE)
+    else:
+        discard(AUTOSAVE_FILE)
+
+
+def new_game(config, pool, journal):
+    """Finish the last game's journal and start a freshly seeded game with its own"""
+    journal.close()
+    game = Game(config, seed=random.getrandbits(63), board_pool=pool)
+    return game, Journal(JOURNAL_FILE, game)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Minesweeper+")
+    add_arguments(parser)
+    parser.add_argument("--profile", metavar="FILE",
+                        help="time every frame phase from the start and write the timings to FILE on exit "
+                             "(.json for a Chrome trace, otherwise CSV); F3 shows them in game")
+    args = parser.parse_args()
+    config = from_arguments(args)
+    pygame.init()
+    # Create window
+    screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+    pygame.display.set_caption("Minesweeper+")
+    clock = pygame.time.Clock()
+    # No-guess boards come ready-made from a background pool
+    pool = None
+    if config.no_guess:
+        pool = BoardPool()
+        pool.load()
+        pool.warm(config.rows, config.cols, config.mine_count)
+        pool.start()
+    # Initialize game and renderer, picking up a saved game of the same size
+    game = load(AUTOSAVE_FILE, board_pool=pool)
+    if not game or (game.config.rows, game.config.cols, game.config.mine_count) != (
+            config.rows, config.cols, config.mine_count):
+        game = Game(config, seed=random.getrandbits(63), board_pool=pool)
+    game.pause()  # Held at the menu until "Continue"
+    # Every action goes through the journal so the session can be replayed
+    if os.path.exists(JOURNAL_FILE):
+        os.replace(JOURNAL_FILE, JOURNAL_FILE + ".old")
+    journal = Journal(JOURNAL_FILE, game)
+    renderer = Renderer(screen, config)
+    # Menu screens are built once and reused; the main menu again when "Continue" comes or goes
+    can_continue = in_progress(game)
+    scenes = {"menu": main_menu(can_continue), "paused": pause_menu(), "tutorial": HowToPlayScreen()}
+    # Game state control
+    game_state = "menu"  # "menu", "gameplay", "tutorial", "paused"
+    drawn_state = None  # State shown on screen by the previous frame
+    overlay = None  # Profiler timings on screen, toggled with F3
+    profiler.enable(bool(args.profile))
+    scrolling = False  # Whether an arrow key held down scrolled the board last frame
+    running = True
+    while running:
+        # === Wait ===
+        # Sleep until an event, or until the screen changes by itself: at once while
+        # something animates, at the game's next deadline otherwise
+        timeout = None
+        if game_state == "gameplay":
+            deadline = game.next_deadline()
+            if renderer.animating or scrolling:
+                timeout = 0
+            elif deadline is not None:
+                timeout = max(deadline - game.now(), 1)
+        if overlay:
+            timeout = overlay.refresh_ms if timeout is None else min(timeout, overlay.refresh_ms)
+        if timeout == 0:
+            clock.tick(FPS)  # Animation frames are capped at FPS
+            events = pygame.event.get()
+        else:
+            event = pygame.event.wait() if timeout is None else pygame.event.wait(timeout)
+            events = [] if event.type == pygame.NOEVENT else [event] + pygame.event.get()
+        profiler.lap("idle")  # Time spent waiting
+        mouse_pos = pygame.mouse.get_pos()
+        moved = False  # Whether the game changed and needs saving
+        # === Handle events ===
+        for event in events:
+            if event.type == pygame.QUIT:
+                running = False
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                overlay = None if overlay else ProfilerOverlay(profiler)
+                profiler.enable(bool(overlay or args.profile))
+                drawn_state = None  # Redraw the view under the panel
+            # --- MENU STATE ---
+            elif game_state == "menu":
+                if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+                    choice = scenes["menu"].button_at(mouse_pos)
+                    if choice == "Continue":
+                        journal.resume()
+                        game_state = "gameplay"
+                    elif choice == "Start Game":
+                        game, journal = new_game(config, pool, journal)  # reset game
+                        game_state = "gameplay"
+                    elif choice == "How to Play":
+                        game_state = "tutorial"
+                    elif choice == "Quit":
+                        running = False
+            # --- GAMEPLAY STATE ---
+            elif game_state == "gameplay":
+                if event.type == pygame.MOUSEBUTTONDOWN:
+                    if not game.game_over and not game.game_won:
+                        cell = renderer.cell_at(*pygame.mouse.get_pos())
+                        if cell:
+                            row, col = cell
+                            if event.button == 1:  # Left click
+                                journal.reveal(row, col)
+                                moved = True
+                            elif event.button == 3:  # Right click
+                                journal.flag(row, col)
+                                moved = True
+                elif event.type == pygame.MOUSEWHEEL:
+                    renderer.zoom(event.y, pygame.mouse.get_pos())
+                elif event.type == pygame.MOUSEMOTION and event.buttons[1]:  # Middle drag scrolls
+                    renderer.pan(-event.rel[0], -event.rel[1])
+                elif event.type == pygame.KEYDOWN:
+                    if event.key == pygame.K_SPACE:
+                        if game.game_over or game.game_won:
+                            game, journal = new_game(config, pool, journal)  # Restart
+                    elif event.key == pygame.K_r:
+                        if not game.game_over and not game.game_won:
+                            cell = renderer.cell_at(*pygame.mouse.get_pos())
+                            if cell:
+                                journal.radar(*cell)
+                                moved = True
+                    elif event.key == pygame.K_s:
+                        journal.shield()
+                        moved = True
+                    elif event.key == pygame.K_h:
+                        journal.hint()
+                        moved = True
+                    elif event.key == pygame.K_ESCAPE:
+                        journal.pause()
+                        game_state = "menu"  # Return to menu anytime
+                    elif event.key == pygame.K_p:
+                        journal.pause()
+                        game_state = "paused"  # Pause the game
+            # --- PAUSED STATE ---
+            elif game_state == "paused":
+                if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+                    choice = scenes["paused"].button_at(mouse_pos)
+                    if choice == "Resume":
+                        journal.resume()
+                        game_state = "gameplay"
+                    elif choice == "Restart":
+                        game, journal = new_game(config, pool, journal)  # Reset game
+                        game_state = "gameplay"
+                    elif choice == "Main Menu":
+                        game_state = "menu"
+            # --- TUTORIAL STATE ---
+            elif game_state == "tutorial":
+                if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+                    game_state = "menu"
+        if moved:
+            autosave(game)
+        profiler.lap("events")
+
+        # === DRAW ===
+        if game_state != drawn_state:
+            if game_state == "menu" and in_progress(game) != can_continue:
+                can_continue = in_progress(game)
+                scenes["menu"] = main_menu(can_continue)
+            # Another view drew over the screen, so this one starts from scratch
+            scenes.get(game_state, renderer).invalidate()
+            drawn_state = game_state
+        if game_state == "gameplay":
+            keys = pygame.key.get_pressed()
+            scrolling = renderer.pan((keys[pygame.K_RIGHT] - keys[pygame.K_LEFT]) * PAN_SPEED,
+                                     (keys[pygame.K_DOWN] - keys[pygame.K_UP]) * PAN_SPEED)
+            game.update()
+            profiler.lap("update")
+            dirty_rects = renderer.draw_game(game)
+        else:
+            dirty_rects = scenes[game_state].draw(screen)
+        if overlay:
+            dirty_rects.append(overlay.draw(screen, pygame.time.get_ticks()))
+        profiler.lap("draw")
+        # Only push the parts of the screen that changed
+        pygame.display.update(dirty_rects)
+        profiler.lap("display")
+
+    autosave(game)  # Timers are saved as game time left, so they resume where they stopped
+    journal.close()
+    if args.profile:
+        profiler.export(args.profile)
+    if pool:
+        pool.stop()
+        pool.save()
+    pygame.quit()
+    sys.exit()
+
+if __name__ == "__main__":
+    main()
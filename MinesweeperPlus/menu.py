@@ -1,57 +1,78 @@
-# menu.py
-# Menu rendering functions
-import pygame
-from constants import *
-
-def draw_main_menu(screen):
-    screen.fill(DARK_GRAY)
-    # Fonts
-    title_font = pygame.font.Font(None, 80)
-    button_font = pygame.font.Font(None, 50)
-    # Title text
-    title_text = title_font.render("MINESWEEPER+", True, GOLD)
-    title_rect = title_text.get_rect(center=(WINDOW_WIDTH // 2, 150))
-    screen.blit(title_text, title_rect)
-    # Buttons (rectangles + text)
-    buttons = [
-        {"text": "Start Game", "y": 300},
-        {"text": "How to Play", "y": 400},
-        {"text": "Quit", "y": 500},
-    ]
-    mouse_x, mouse_y = pygame.mouse.get_pos()
-    for b in buttons:
-        rect = pygame.Rect(WINDOW_WIDTH // 2 - 150, b["y"], 300, 60)
-        color = ORANGE if rect.collidepoint(mouse_x, mouse_y) else GRAY
-        pygame.draw.rect(screen, color, rect, border_radius=15)
-        text = button_font.render(b["text"], True, BLACK)
-        text_rect = text.get_rect(center=rect.center)
-        screen.blit(text, text_rect)
-    return buttons
-
-def draw_pause_menu(screen):
-    screen.fill(DARK_GRAY)
-    title_font = pygame.font.Font(None, 80)
-    button_font = pygame.font.Font(None, 50)
-
-    # Title
-    title_text = title_font.render("PAUSED", True, GOLD)
-    title_rect = title_text.get_rect(center=(WINDOW_WIDTH // 2, 150))
-    screen.blit(title_text, title_rect)
-
-    # Buttons
-    buttons = [
-        {"text": "Resume", "y": 300},
-        {"text": "Restart", "y": 400},
-        {"text": "Main Menu", "y": 500},
-    ]
-
-    mouse_x, mouse_y = pygame.mouse.get_pos()
-    for b in buttons:
-        rect = pygame.Rect(WINDOW_WIDTH // 2 - 150, b["y"], 300, 60)
-        color = ORANGE if rect.collidepoint(mouse_x, mouse_y) else GRAY
-        pygame.draw.rect(screen, color, rect, border_radius=15)
-        text = button_font.render(b["text"], True, BLACK)
-        text_rect = text.get_rect(center=rect.center)
-        screen.blit(text, text_rect)
-
-    return buttons
+# menu.py
+# Menu screens with cached fonts, background and button images
+import pygame
+from constants import *
+from scene import Scene
+
+class Menu(Scene):
+    """A title and a column of buttons; only buttons whose hover state changed are redrawn"""
+    def __init__(self, title, labels):
+        super().__init__()
+        self.title = title
+        # Fonts
+        self.title_font = pygame.font.Font(None, 80)
+        self.button_font = pygame.font.Font(None, 50)
+        # Buttons (rectangles + text)
+        self.buttons = [
+            {"text": text, "rect": pygame.Rect(WINDOW_WIDTH // 2 - 150, 300 + i * 100, 300, 60)}
+            for i, text in enumerate(labels)
+        ]
+        self._hover_images = []
+        self._hovered = None  # Index of the button drawn highlighted on screen
+
+    def invalidate(self):
+        super().invalidate()
+        self._hovered = None
+
+    def button_at(self, pos):
+        """Text of the button under pos, or None"""
+        for b in self.buttons:
+            if b["rect"].collidepoint(pos):
+                return b["text"]
+        return None
+
+    def _draw_button(self, surface, b, rect, color):
+        pygame.draw.rect(surface, color, rect, border_radius=15)
+        text = self.button_font.render(b["text"], True, BLACK)
+        text_rect = text.get_rect(center=rect.center)
+        surface.blit(text, text_rect)
+
+    def build(self, surface):
+        surface.fill(DARK_GRAY)
+        # Title text
+        title_text = self.title_font.render(self.title, True, GOLD)
+        title_rect = title_text.get_rect(center=(WINDOW_WIDTH // 2, 150))
+        surface.blit(title_text, title_rect)
+        for b in self.buttons:
+            # Highlighted version, on a copy of the background behind the button
+            hover = surface.subsurface(b["rect"]).copy()
+            self._draw_button(hover, b, hover.get_rect(), ORANGE)
+            self._hover_images.append(hover)
+            self._draw_button(surface, b, b["rect"], GRAY)
+
+    def update(self, screen):
+        hovered = None
+        mouse_x, mouse_y = pygame.mouse.get_pos()
+        for i, b in enumerate(self.buttons):
+            if b["rect"].collidepoint(mouse_x, mouse_y):
+                hovered = i
+        if hovered == self._hovered:
+            return []
+        rects = []
+        if self._hovered is not None:
+            rect = self.buttons[self._hovered]["rect"]
+            rects.append(screen.blit(self.background, rect, rect))
+        if hovered is not None:
+            rects.append(screen.blit(self._hover_images[hovered], self.buttons[hovered]["rect"]))
+        self._hovered = hovered
+        return rects
+
+
+def main_menu(can_continue=False):
+    """Title menu; "Continue" leads when there is a game to go back to"""
+    labels = ["Start Game", "How to Play", "Quit"]
+    return Menu("MINESWEEPER+", ["Continue"] + labels if can_continue else labels)
+
+
+def pause_menu():
+    return Menu("PAUSED", ["Resume", "Restart", "Main Menu"])
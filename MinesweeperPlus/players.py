@@ -0,0 +1,141 @@
+# players.py
+# Scripted players that drive a Game through its public actions, for simulations
+import numpy as np
+from constants import *
+from board import neighbor_sum
+
+class RandomPlayer:
+    """Reveals random hidden cells and spends power-ups as soon as it has them"""
+    name = "random"
+    think_ms = 500  # Game time that passes before each move
+
+    def move(self, game, rng):
+        board = game.board
+        if game.hint_uses_left > 0 and not game.first_click:
+            game.use_hint()
+            return
+        if game.shield_uses_left > 0 and not game.shield_active and not game.first_click:
+            game.toggle_shield()
+        hidden = np.flatnonzero(~(board.revealed | board.flagged))
+        row, col = divmod(int(rng.choice(hidden)), board.cols)
+        game.reveal_cell(row, col)
+
+
+class BasicSolverPlayer:
+    """Plays the single-cell rules a careful human uses, only from what is visible.
+    Reveals cells whose number is already satisfied by flags, flags cells that
+    must be mines, and when stuck spends a hint, then a radar scan, then a
+    shielded guess."""
+    name = "basic"
+    think_ms = 300
+
+    def __init__(self):
+        self.game = None
+        self.pending = []  # Deduced (action, flat index) not yet played; they stay true as play goes on
+
+    def move(self, game, rng):
+        board = game.board
+        if game is not self.game:
+            self.game = game
+            self.pending = []
+        if game.first_click:
+            game.reveal_cell(board.rows // 2, board.cols // 2)
+            return
+        if not self._next_pending(board):
+            safe, mines = self.deductions(board)
+            self.pending = [("flag", i) for i in mines.tolist()[::-1]] + [("reveal", i) for i in safe.tolist()[::-1]]
+        action = self._next_pending(board)
+        if action:
+            kind, index = self.pending.pop()
+            if kind == "reveal":
+                game.reveal_cell(*divmod(index, board.cols))
+            else:
+                game.toggle_flag(*divmod(index, board.cols))
+            return
+        if game.hint_uses_left > 0:
+            game.use_hint()
+            return
+        if game.radar_uses_left > 0 and not game.radar_active:
+            self.scan(game, rng)
+            return
+        if game.shield_uses_left > 0 and not game.shield_active:
+            game.toggle_shield()
+        self.guess(game, rng)
+
+    def _next_pending(self, board):
+        """Drop deductions a cascade has already played out and peek at the next one"""
+        while self.pending:
+            index = self.pending[-1][1]
+            if not (board.revealed.flat[index] or board.flagged.flat[index]):
+                return self.pending[-1]
+            self.pending.pop()
+        return None
+
+    def deductions(self, board):
+        """Flat indices of hidden cells that are certainly safe and certainly mines"""
+        hidden = ~(board.revealed | board.flagged)
+        # A mine uncovered under a shield is as good as a flag
+        known_mines = board.flagged | (board.revealed & board.mines)
+        numbers = board.revealed & ~board.mines
+        flags_near = neighbor_sum(known_mines).astype(np.int16)
+        hidden_near = neighbor_sum(hidden).astype(np.int16)
+        needed = board.neighbors.astype(np.int16) - flags_near
+        satisfied = numbers & (needed == 0) & (hidden_near > 0)
+        saturated = numbers & (needed == hidden_near) & (hidden_near > 0)
+        safe = hidden & (neighbor_sum(satisfied) > 0)
+        mines = hidden & (neighbor_sum(saturated) > 0) & ~safe
+        return np.flatnonzero(safe), np.flatnonzero(mines)
+
+    def scan(self, game, rng):
+        """Radar a random hidden cell; if the count settles the area, queue the result"""
+        board = game.board
+        hidden = np.flatnonzero(~(board.revealed | board.flagged))
+        row, col = divmod(int(rng.choice(hidden)), board.cols)
+        game.radar_at(row, col)
+        area = (slice(max(row - RADAR_RADIUS, 0), row + RADAR_RADIUS + 1),
+                slice(max(col - RADAR_RADIUS, 0), col + RADAR_RADIUS + 1))
+        unknown = ~(board.revealed[area] | board.flagged[area])
+        known_mines = int((board.flagged[area] | (board.revealed[area] & board.mines[area])).sum())
+        left = game.radar_mine_count - known_mines
+        if left == 0 or left == unknown.sum():
+            kind = "reveal" if left == 0 else "flag"
+            rows, cols = np.nonzero(unknown)
+            self.pending += [(kind, (r + area[0].start) * board.cols + c + area[1].start)
+                             for r, c in zip(rows.tolist(), cols.tolist())]
+
+    def guess(self, game, rng):
+        board = game.board
+        hidden = np.flatnonzero(~(board.revealed | board.flagged))
+        game.reveal_cell(*divmod(int(rng.choice(hidden)), board.cols))
+
+
+class ProbabilityPlayer:
+    """Flags cells that are certainly mines and otherwise reveals the hidden cell
+    least likely to be one; when every choice is a risk it spends a hint, or
+    raises a shield before guessing."""
+    name = "probability"
+    think_ms = 300
+
+    def move(self, game, rng):
+        board = game.board
+        if game.first_click:
+            game.reveal_cell(board.rows // 2, board.cols // 2)
+            return
+        chances = game.probabilities.compute()
+        hidden = ~(board.revealed | board.flagged)
+        mines = np.flatnonzero(hidden & (chances > 1 - 1e-9))
+        if mines.size:
+            game.toggle_flag(*divmod(int(mines[0]), board.cols))
+            return
+        best = chances[hidden].min()
+        if best > 1e-9:
+            if game.hint_uses_left > 0:
+                game.use_hint()
+                return
+            if game.shield_uses_left > 0 and not game.shield_active:
+                game.toggle_shield()
+        candidates = np.flatnonzero(hidden & (chances <= best + 1e-9))
+        game.reveal_cell(*divmod(int(rng.choice(candidates)), board.cols))
+
+
+PLAYERS = {player.name: player for player in (RandomPlayer, BasicSolverPlayer, ProbabilityPlayer)}
@@ -0,0 +1,430 @@
+# probability.py
+# Mine probability for every hidden cell, from the revealed numbers, flags and
+# the number of mines still unaccounted for
+import math
+import time
+from itertools import compress
+import numpy as np
+from board import neighbor_sum
+from solver import Rules
+
+# The 3x3 block around a cell, the cell included, and the 8 neighbors alone in board order
+_AROUND_ROWS = np.array([dr for dr in (-1, 0, 1) for dc in (-1, 0, 1)])
+_AROUND_COLS = np.array([dc for dr in (-1, 0, 1) for dc in (-1, 0, 1)])
+_NEIGHBOR_ROWS = np.delete(_AROUND_ROWS, 4)
+_NEIGHBOR_COLS = np.delete(_AROUND_COLS, 4)
+
+class ProbabilityMap:
+    """Exact mine probabilities for the frontier, weighted by how the remaining
+    mines can be spread over the cells no number touches.
+    The frontier splits into components that share no constraint. Each one is
+    solved on its own into "how many layouts put k mines here, and how often is
+    each cell a mine among them", and keeps that until a reveal or flag changes
+    it. The components themselves are kept up to date from the cells that
+    changed since the last call, so only the constraints around them are
+    rebuilt and only the components they touch are regrouped and re-solved.
+    One time budget covers a compute() call, combining the components included:
+    components are enumerated in the first half, the ones that did not finish
+    are sampled in the rest, and any left when it runs out get a density
+    estimate. Sampled and estimated components are tried again by later calls;
+    only one that enumeration could not finish with a fair share of the time
+    keeps its sampled result. While nothing changes and nothing is left to
+    solve, compute() returns the last result again.
+    Flags count as mines, as they do for the mine counter on the HUD."""
+    def __init__(self, board, mine_count, budget_ms=20, samples=200, rng=None):
+        self.board = board
+        self.mine_count = mine_count
+        self.budget_ms = budget_ms  # Solving time per compute(), enumeration and sampling together
+        self.samples = samples  # Layouts drawn for a component that is sampled
+        self.rng = rng or np.random.default_rng()
+        self.exact = True  # False when the last compute() relied on a sampled or estimated component
+        # Cell states as of the last update: 0 hidden, 1 flagged, 2 revealed
+        self._state = np.zeros(board.rows * board.cols, dtype=np.uint8)
+        self._constraints = {}  # Number index -> (number index, mines needed, hidden cells)
+        self._owners = {}  # Hidden cell -> indices of the numbers whose constraint holds it
+        self._component_of = {}  # Number index -> _Component
+        self._is_number = np.zeros(board.rows * board.cols, dtype=bool)  # Cells with a constraint
+        self._share = np.zeros(board.rows * board.cols)  # Mines a constraint needs per hidden cell
+        self._components = set()
+        self._probabilities = None  # The last compute() result, good until something changes
+        self._combine_seconds = 0.0  # How long the last compute() spent combining the components
+
+    def components(self):
+        """Independent frontier components as lists of (constraint index, mines needed, cell indices)"""
+        self._update()
+        return [list(component.constraints) for component in self._ordered()]
+
+    def _ordered(self):
+        return sorted(self._components, key=lambda component: component.constraints[0][0])
+
+    def _update(self):
+        """Bring the constraints and components up to date with the cells that changed"""
+        board = self.board
+        state = board.revealed.reshape(-1).view(np.uint8) * 2 + board.flagged.reshape(-1)
+        changed = np.flatnonzero(state != self._state)
+        if not changed.size:
+            return
+        self._state = state
+        self._probabilities = None
+        # Only numbers next to a changed cell, or the changed cells themselves, can have a new constraint
+        rows, cols = board.rows, board.cols
+        r = changed[:, None] // cols + _AROUND_ROWS
+        c = changed[:, None] % cols + _AROUND_COLS
+        inside = (r >= 0) & (r < rows) & (c >= 0) & (c < cols)
+        near = np.zeros(rows * cols, dtype=bool)
+        near[r[inside] * cols + c[inside]] = True
+        touched = np.flatnonzero(near)
+        # The neighbors of every touched cell at once: which are hidden and which are known mines
+        r = touched[:, None] // cols + _NEIGHBOR_ROWS
+        c = touched[:, None] % cols + _NEIGHBOR_COLS
+        inside = (r >= 0) & (r < rows) & (c >= 0) & (c < cols)
+        around = np.where(inside, r * cols + c, 0)
+        hidden = inside & (state[around] == 0)
+        known = inside & (board.flagged.reshape(-1)[around] | (board.revealed & board.mines).reshape(-1)[around])
+        numbers = board.revealed.reshape(-1)[touched] & ~board.mines.reshape(-1)[touched] & hidden.any(axis=1)
+        needed = board.neighbors.reshape(-1)[touched].astype(np.int64) - known.sum(axis=1)
+        # Only numbers, and cells that were numbers, can have a constraint to add or drop
+        keep = numbers | self._is_number[touched]
+        self._is_number[touched] = numbers
+        self._share[touched] = np.where(numbers, needed / np.maximum(hidden.sum(axis=1), 1), 0.0)
+        touched, numbers, needed = touched[keep], numbers[keep], needed[keep]
+        around, hidden = around[keep], hidden[keep]
+        dirty = set()  # Components to regroup
+        fresh = []  # Numbers with a new or changed constraint
+        for index, is_number, count, cells, open_ in zip(touched.tolist(), numbers.tolist(), needed.tolist(),
+                                                          around.tolist(), hidden.tolist()):
+            old = self._constraints.get(index)
+            new = None
+            if is_number:
+                new = (index, count, tuple(compress(cells, open_)))
+            if new == old:
+                continue
+            if old is not None:
+                dirty.add(self._component_of.pop(index))
+                del self._constraints[index]
+                for cell in old[2]:
+                    owners = self._owners[cell]
+                    owners.discard(index)
+                    if not owners:
+                        del self._owners[cell]
+            if new is not None:
+                self._constraints[index] = new
+                fresh.append(index)
+        # A new constraint joins every component it shares a cell with
+        for index in fresh:
+            for cell in self._constraints[index][2]:
+                owners = self._owners.setdefault(cell, set())
+                for other in owners:
+                    component = self._component_of.get(other)
+                    if component is not None:
+                        dirty.add(component)
+                owners.add(index)
+        # Regroup what the dirty components held with the new constraints; nothing else can have moved
+        members = [index for component in dirty for index, _, _ in component.constraints
+                   if self._component_of.get(index) is component] + fresh
+        self._components -= dirty
+        parent = {}  # Union-find over their cells
+
+        def find(cell):
+            while parent[cell] != cell:
+                parent[cell] = parent[parent[cell]]
+                cell = parent[cell]
+            return cell
+
+        for index in members:
+            cells = self._constraints[index][2]
+            for cell in cells:
+                parent.setdefault(cell, cell)
+            root = find(cells[0])
+            for cell in cells[1:]:
+                parent[find(cell)] = root
+        groups = {}
+        for index in sorted(members):
+            constraint = self._constraints[index]
+            groups.setdefault(find(constraint[2][0]), []).append(constraint)
+        unchanged = {component.constraints: component for component in dirty}
+        for constraints in groups.values():
+            constraints = tuple(constraints)
+            component = unchanged.get(constraints) or _Component(constraints)
+            self._components.add(component)
+            for index, _, _ in constraints:
+                self._component_of[index] = component
+
+    def compute(self):
+        """Probability that each cell is a mine, as a float array shaped like the board.
+        Revealed cells are 0 (1 for mines uncovered under a shield), flags are 1."""
+        board = self.board
+        started = time.perf_counter()
+        self._update()
+        components = self._ordered()
+        pending = [component for component in components if component.result is None]
+        if not pending and self._probabilities is not None:
+            return self._probabilities.copy()
+        # The combination below counts against the budget too, so solving stops as long before as it last took
+        sampled = self._solve(pending, started, started + self.budget_ms / 1000 - self._combine_seconds)
+        combining = time.perf_counter()
+        results = [component.result or sampled.get(component) for component in components]
+        self.exact = all(component.result is not None and not component.sampled for component in components)
+
+        hidden = ~(board.revealed | board.flagged)
+        owners = neighbor_sum(self._is_number.reshape(board.rows, board.cols))  # Constraints on each cell
+        unconstrained = (hidden & (owners == 0)).reshape(-1)
+        outside = int(unconstrained.sum())  # Hidden cells no number touches
+        known_mines = int((board.flagged | (board.revealed & board.mines)).sum())
+        remaining = self.mine_count - known_mines
+        probabilities = (board.flagged | (board.revealed & board.mines)).astype(float)
+        flat = probabilities.reshape(-1)
+
+        # A component whose layouts all hold the same number of mines does not depend on the
+        # others: its cells keep their share of its layouts and it only shifts the total.
+        # The unsolved components together count as one: each cell gets the mean density
+        # of its constraints and they hold the rounded sum.
+        shift = 0
+        guessed = (hidden & (owners > 0)).reshape(-1)
+        solved = [result[0] for result in results if result is not None]
+        if solved:
+            guessed[np.concatenate(solved)] = False
+        if guessed.any():
+            share = neighbor_sum(self._share.reshape(board.rows, board.cols)).reshape(-1)
+            density = np.clip(share[guessed] / owners.reshape(-1)[guessed], 0.0, 1.0)
+            flat[guessed] = density
+            shift += int(round(density.sum()))
+        spread = []  # Components whose mine count varies
+        fixed_cells, fixed = [], []
+        for result in results:
+            if result is None:
+                continue
+            cells, layouts, mine_hits = result
+            if np.count_nonzero(layouts) == 1:
+                mines = int(layouts.argmax())
+                fixed_cells.append(cells)
+                fixed.append(mine_hits[mines] / layouts[mines])
+                shift += mines
+            else:
+                spread.append(result)
+        if fixed:
+            flat[np.concatenate(fixed_cells)] = np.concatenate(fixed)
+
+        # Weight of putting shift + t mines on the whole frontier: the layouts of the rest,
+        # C(outside, remaining - shift - t)
+        most = sum(len(layouts) - 1 for _, layouts, _ in spread)
+        log_rest = _log_comb(outside, remaining - shift - np.arange(most + 1))
+        rest = np.exp(log_rest - log_rest.max()) if np.isfinite(log_rest).any() else np.zeros(most + 1)
+        # before[i][m]: layouts of the components before i with m mines among them.
+        # after[i][m]: weight of the components from i on and the rest, given m mines before i.
+        # Both are rescaled as they grow, with the log of the scale kept alongside.
+        before, before_log = [np.ones(1)], [0.0]
+        for _, layouts, _ in spread:
+            before.append(np.convolve(before[-1], layouts))
+            before_log.append(before_log[-1] + _rescale(before))
+        after, after_log = [rest], [0.0]
+        for _, layouts, _ in reversed(spread):
+            after.append(np.correlate(after[-1], layouts, "valid"))
+            after_log.append(after_log[-1] + _rescale(after))
+        after.reverse()
+        after_log.reverse()
+        total = before[-1]
+        norm = float(total @ rest)
+        if norm <= 0:
+            # The flags contradict the numbers; spread the remaining mines evenly
+            flat[hidden.reshape(-1)] = min(max(remaining, 0) / max(int(hidden.sum()), 1), 1.0)
+        else:
+            for i, (cells, layouts, mine_hits) in enumerate(spread):
+                # weight[k]: chance-weight of this component holding k mines, the others anything
+                weight = np.correlate(after[i + 1], before[i], "valid")
+                scale = math.exp(before_log[i] + after_log[i + 1] - before_log[-1])
+                flat[cells] = (weight @ mine_hits) * scale / norm
+            if outside:
+                expected_outside = float((total * rest) @ (remaining - shift - np.arange(total.size))) / norm
+                flat[unconstrained] = expected_outside / outside
+        self._probabilities = probabilities
+        self._combine_seconds = time.perf_counter() - combining
+        return probabilities.copy()
+
+    def _solve(self, pending, started, deadline):
+        """Solve new components by `deadline`: enumerate, smallest first, up to halfway
+        there from `started`, then share the rest among those that did not finish for
+        sampling. A sampled result only stands for this call, and is returned rather
+        than kept, unless enumeration had a fair share of the time and still ran out."""
+        enumerate_until = started + (deadline - started) / 2
+        fair_share = (enumerate_until - time.perf_counter()) / 2  # Half of what is left for enumerating
+        pending.sort(key=lambda component: len(component.constraints))
+        tried = False
+        for component in pending:
+            now = time.perf_counter()
+            if now >= enumerate_until and tried:
+                break
+            if not component.too_big:
+                # One component is always tried, so a budget smaller than the combination still gets somewhere
+                tried = True
+                component.result = self._enumerate(component.constraints, component.cells, enumerate_until)
+                component.too_big = component.result is None and 0 < fair_share <= enumerate_until - now
+        missed = [component for component in pending if component.result is None]
+        sampled = {}
+        for i, component in enumerate(missed):
+            now = time.perf_counter()
+            if now >= deadline:
+                break
+            result = self._sample(component.constraints, component.cells, now + (deadline - now) / (len(missed) - i))
+            if result is None:
+                continue
+            if component.too_big:
+                component.result = result
+                component.sampled = True
+            else:
+                sampled[component] = result
+        return sampled
+
+    def _enumerate(self, constraints, cells, deadline):
+        """Count every layout of one component by its mine count; None if the deadline passes"""
+        rules = Rules(cells.tolist(), [(own, needed) for _, needed, own in constraints])
+        assignment = [0] * len(cells)
+        layouts = np.zeros(len(cells) + 1)
+        mine_hits = np.zeros((len(cells) + 1, len(cells)))
+        nodes = 0
+
+        def place(i, mines):
+            nonlocal nodes
+            nodes += 1
+            if not nodes & 1023 and time.perf_counter() > deadline:
+                raise _OutOfTime()
+            if i == len(cells):
+                layouts[mines] += 1
+                mine_hits[mines] += assignment
+                return
+            for is_mine in (0, 1):
+                if rules.assign(i, is_mine):
+                    assignment[i] = is_mine
+                    place(i + 1, mines + is_mine)
+                rules.unassign(i, is_mine)
+            assignment[i] = 0
+
+        try:
+            place(0, 0)
+        except _OutOfTime:
+            return None
+        return _scaled(cells, layouts, mine_hits)
+
+    def _sample(self, constraints, cells, deadline):
+        """Estimate a component from random layouts that satisfy every constraint.
+        Each sample fills the cells in walk order, trying mine or safe first at
+        random and backing off whenever a constraint can no longer be met. The
+        layouts are not drawn uniformly, so the result is approximate. Sampling
+        stops after `samples` layouts or at the deadline; None if none was found."""
+        rules = Rules(cells.tolist(), [(own, needed) for _, needed, own in constraints])
+        layouts = np.zeros(len(cells) + 1)
+        mine_hits = np.zeros((len(cells) + 1, len(cells)))
+        drawn = 0
+        while drawn < self.samples and time.perf_counter() < deadline:
+            layout = self._draw(rules, len(cells), deadline)
+            if layout is not None:
+                mines = int(layout.sum())
+                layouts[mines] += 1
+                mine_hits[mines] += layout
+                drawn += 1
+        if not drawn:
+            return None
+        # One even pseudo-layout per mine count seen, so no estimate is ever a false 0 or 1
+        counts = np.flatnonzero(layouts)
+        layouts[counts] += 1
+        mine_hits[counts] += counts[:, None] / len(cells)
+        return _scaled(cells, layouts, mine_hits)
+
+    def _draw(self, rules, size, deadline, max_nodes=5000):
+        """One depth-first walk with a coin flip for which value each cell tries first"""
+        rules.reset()
+        layout = np.zeros(size)
+        untried = [self.rng.permutation(2).tolist()]  # Values still to try at each depth
+        nodes = 0
+        while untried:
+            nodes += 1
+            if nodes > max_nodes or not nodes & 1023 and time.perf_counter() > deadline:
+                return None
+            i = len(untried) - 1
+            if not untried[-1]:
+                # Both values failed here: step back and undo the cell before
+                untried.pop()
+                if i:
+                    rules.unassign(i - 1, int(layout[i - 1]))
+                    layout[i - 1] = 0
+                continue
+            is_mine = untried[-1].pop()
+            if rules.assign(i, is_mine):
+                layout[i] = is_mine
+                if i + 1 == size:
+                    return layout
+                untried.append(self.rng.permutation(2).tolist())
+            else:
+                rules.unassign(i, is_mine)
+        return None
+
+
+class _Component:
+    """One independent part of the frontier, and its solution once there is one"""
+    __slots__ = ("constraints", "_cells", "result", "sampled", "too_big")
+
+    def __init__(self, constraints):
+        self.constraints = constraints  # (number index, mines needed, hidden cells), by number index
+        self._cells = None
+        self.result = None  # (cells, layouts per mine count, cell mine counts per mine count)
+        self.sampled = False  # Whether the result is a sampled estimate, kept because it is too big
+        self.too_big = False  # Whether enumeration ran out of time with a fair share of it
+
+    @property
+    def cells(self):
+        """The hidden cells as an array in walk order, worked out the first time they are needed"""
+        if self._cells is None:
+            self._cells = np.array(_walk(self.constraints))
+        return self._cells
+
+
+def _walk(constraints):
+    """A component's cells in the order a breadth-first walk over its constraints
+    meets them, so each constraint is closed soon after it is opened and the
+    search prunes early"""
+    touching = {}
+    for constraint in constraints:
+        for cell in constraint[2]:
+            touching.setdefault(cell, []).append(constraint)
+    cells = []
+    seen = set()
+    queued = {constraints[0]}
+    pending = [constraints[0]]
+    for constraint in pending:  # The list grows while it is walked
+        for cell in constraint[2]:
+            if cell not in seen:
+                seen.add(cell)
+                cells.append(cell)
+                for other in touching[cell]:
+                    if other not in queued:
+                        queued.add(other)
+                        pending.append(other)
+    return cells
+
+
+def _scaled(cells, layouts, mine_hits):
+    """Scale a component's counts so its largest is 1; only ratios matter and
+    the product over many components would otherwise overflow"""
+    scale = layouts.max() or 1.0
+    return cells, layouts / scale, mine_hits / scale
+
+
+def _rescale(counts):
+    """Divide the last array of a list by its largest entry; returns the log of the factor"""
+    scale = counts[-1].max()
+    if scale <= 0:
+        return 0.0
+    counts[-1] = counts[-1] / scale
+    return math.log(scale)
+
+
+def _log_comb(n, k):
+    """log C(n, k) for an array of k, -inf where there is no way to choose"""
+    log_factorial = np.concatenate(([0.0], np.cumsum(np.log(np.arange(1, n + 1)))))
+    valid = (k >= 0) & (k <= n)
+    k = np.where(valid, k, 0)
+    return np.where(valid, log_factorial[n] - log_factorial[k] - log_factorial[n - k], -np.inf)
+
+
+class _OutOfTime(Exception):
+    """Raised when enumeration runs past the time budget"""
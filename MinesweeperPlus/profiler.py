@@ -0,0 +1,107 @@
+# profiler.py
+# Named timing sections for the main loop and hot game operations, with rolling
+# percentiles and CSV / Chrome trace export; close to free while switched off
+import csv
+import functools
+import json
+from collections import deque
+from contextlib import nullcontext
+from time import perf_counter_ns
+import numpy as np
+
+WINDOW = 240  # Samples per section the percentiles are taken over (4 s at 60 fps)
+TRACE_LIMIT = 500_000  # Most recent timings kept for export
+
+_IDLE = nullcontext()  # Handed out by section() while disabled
+
+class _Section:
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = perf_counter_ns()
+
+    def __exit__(self, *exc):
+        self.profiler.record(self.name, self.start, perf_counter_ns())
+
+
+class Profiler:
+    """Collects how long named sections take. A section is timed either as a
+    `with profiler.section(name):` block or, for phases that follow each other
+    in a loop, with lap(name), which times everything since the previous lap.
+    Both do nothing but one attribute check while the profiler is disabled."""
+    def __init__(self, window=WINDOW, trace_limit=TRACE_LIMIT):
+        self.enabled = False
+        self.window = window
+        self.samples = {}  # Section name -> deque of recent durations (ms)
+        self.trace = deque(maxlen=trace_limit)  # (name, start ns, end ns)
+        self._origin = perf_counter_ns()
+        self._lap = 0
+
+    def enable(self, enabled=True):
+        self.enabled = enabled
+        self._lap = perf_counter_ns()
+
+    def section(self, name):
+        """Context manager timing its block under `name`"""
+        if not self.enabled:
+            return _IDLE
+        return _Section(self, name)
+
+    def lap(self, name):
+        """Time everything since the previous lap as `name`"""
+        if not self.enabled:
+            return
+        now = perf_counter_ns()
+        self.record(name, self._lap, now)
+        self._lap = now
+
+    def record(self, name, start, end):
+        samples = self.samples.get(name)
+        if samples is None:
+            samples = self.samples[name] = deque(maxlen=self.window)
+        samples.append((end - start) / 1e6)
+        self.trace.append((name, start, end))
+
+    def percentiles(self):
+        """(name, p50 ms, p99 ms, samples) for every section seen, in first-seen order"""
+        rows = []
+        for name, samples in self.samples.items():
+            p50, p99 = np.percentile(np.fromiter(samples, dtype=float, count=len(samples)), (50, 99))
+            rows.append((name, float(p50), float(p99), len(samples)))
+        return rows
+
+    def export(self, path):
+        """Write the kept timings: a .json path gets a Chrome trace (chrome://tracing,
+        Perfetto), anything else a CSV of section, start and duration in ms"""
+        if path.endswith(".json"):
+            events = [{"name": name, "ph": "X", "pid": 0, "tid": 0,
+                       "ts": (start - self._origin) / 1e3, "dur": (end - start) / 1e3}
+                      for name, start, end in self.trace]
+            with open(path, "w") as file:
+                json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, file)
+            return
+        with open(path, "w", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(["section", "start_ms", "duration_ms"])
+            for name, start, end in self.trace:
+                writer.writerow([name, f"{(start - self._origin) / 1e6:.3f}", f"{(end - start) / 1e6:.3f}"])
+
+
+profiler = Profiler()  # Shared by the main loop, the renderer and the game logic
+
+
+def timed(name):
+    """Decorator timing every call of a function as a profiler section"""
+    def decorate(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not profiler.enabled:
+                return function(*args, **kwargs)
+            with _Section(profiler, name):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorate
@@ -0,0 +1,172 @@
+# savegame.py
+# Versioned binary snapshots of a game in progress, for autosave and crash recovery
+import mmap
+import os
+import struct
+import zlib
+import numpy as np
+from constants import *
+from config import GameConfig
+from game_logic import Game
+
+_MAGIC = b"MSSAVE"
+VERSION = 3
+COMPRESSED = 1  # Header flag: everything after the header is zlib-compressed
+_HEADER = struct.Struct("<6sHHI")  # magic, version, flags, CRC-32 of everything after the header
+# rows, cols, mines, power-ups, time limit, cell size, no-guess, then SCORING values
+_CONFIG = struct.Struct("<IIIIiI?" + "q" * len(SCORING))
+# score, combo, flags placed, safe cells left, correct flags, time remaining, status bits,
+# game ms since the first click, radar row, col and mine count, radar, shield and hint
+# uses left, hint row and col, number of running timers
+_STATE = struct.Struct("<qIiIIiBqiiI3IiiB")
+_TIMER = struct.Struct("<Bq")  # Index in TIMERS, game ms left
+_RNG = struct.Struct("<16s16sIQ")  # PCG64 state, increment, has_uint32, uinteger
+TIMERS = ("countdown", "radar", "shield", "hint", "combo")
+# Status bits
+_FIRST_CLICK, _GAME_OVER, _GAME_WON, _RADAR, _SHIELD, _HINT, _PAUSED = (1 << bit for bit in range(7))
+
+def snapshot(game, compress=False):
+    """The game as bytes. Timers are kept as game time left, so a restored
+    game carries on from the same moment on any clock."""
+    config = game.config
+    status = ((_FIRST_CLICK if game.first_click else 0) | (_GAME_OVER if game.game_over else 0) |
+              (_GAME_WON if game.game_won else 0) | (_RADAR if game.radar_active else 0) |
+              (_SHIELD if game.shield_active else 0) | (_HINT if game.hint_cell else 0) |
+              (_PAUSED if game.scheduler.paused else 0))
+    with game.scheduler.pinned():  # Timers and the elapsed time from one clock reading
+        timers = game.scheduler.timers()
+        elapsed = 0 if game.first_click else game.now() - game.start_time
+    hint_row, hint_col = game.hint_cell or (-1, -1)
+    state = game.rng.bit_generator.state
+    board = game.board
+    power_ups = board.power_ups.reshape(-1)
+    body = b"".join((
+        _CONFIG.pack(config.rows, config.cols, config.mine_count, config.power_up_count, config.time_limit,
+                     config.cell_size, config.no_guess,
+                     *(config.scoring[key] for key in SCORING)),
+        _STATE.pack(game.score, game.combo, game.flags_placed, game.safe_cells_left, game.correct_flags,
+                    game.time_remaining, status, elapsed,
+                    game.radar_center_row, game.radar_center_col, game.radar_mine_count,
+                    game.radar_uses_left, game.shield_uses_left, game.hint_uses_left, hint_row, hint_col,
+                    len(timers)),
+        *(_TIMER.pack(TIMERS.index(name), left) for name, left in timers),
+        _RNG.pack(state["state"]["state"].to_bytes(16, "little"), state["state"]["inc"].to_bytes(16, "little"),
+                  state["has_uint32"], state["uinteger"]),
+        # One bit per cell for each layer; power-up codes take two planes
+        np.packbits(board.mines).tobytes(),
+        np.packbits(board.revealed).tobytes(),
+        np.packbits(board.flagged).tobytes(),
+        np.packbits(power_ups & 1).tobytes(),
+        np.packbits(power_ups >> 1).tobytes(),
+    ))
+    if compress:
+        body = zlib.compress(body, 1)
+    return _HEADER.pack(_MAGIC, VERSION, COMPRESSED if compress else 0, zlib.crc32(body)) + body
+
+
+def restore(data, clock=None, board_pool=None):
+    """Game from snapshot bytes (or any buffer, such as a memory map).
+    Raises ValueError if the data is not a snapshot this version can read."""
+    if len(data) < _HEADER.size:
+        raise ValueError("Not a Minesweeper+ save")
+    magic, version, flags, checksum = _HEADER.unpack_from(data)
+    if magic != _MAGIC:
+        raise ValueError("Not a Minesweeper+ save")
+    if version != VERSION:
+        raise ValueError(f"Save version {version} is not supported")
+    if flags & ~COMPRESSED:
+        raise ValueError(f"Save has unknown flags {flags}")
+    offset = _HEADER.size
+    if zlib.crc32(data[offset:]) != checksum:
+        raise ValueError("Save is truncated or corrupt")
+    if flags & COMPRESSED:
+        data = zlib.decompress(data[offset:])
+        offset = 0
+    # Every length is checked before anything is unpacked or allocated, so a
+    # cut-off or corrupt file fails here with ValueError and nothing else
+    if len(data) < offset + _CONFIG.size + _STATE.size:
+        raise ValueError("Save is truncated")
+    (rows, cols, mine_count, power_up_count, time_limit, cell_size, no_guess,
+     *scoring) = _CONFIG.unpack_from(data, offset)
+    offset += _CONFIG.size
+    state = _STATE.unpack_from(data, offset)
+    offset += _STATE.size
+    timers = state[-1]
+    cells = rows * cols
+    size = (cells + 7) // 8
+    if len(data) < offset + timers * _TIMER.size + _RNG.size + 5 * size:
+        raise ValueError("Save is truncated")
+    config = GameConfig(rows, cols, mine_count, power_up_count, time_limit, cell_size,
+                        dict(zip(SCORING, scoring)), no_guess)
+    game = Game(config, clock=clock, board_pool=board_pool)
+    (game.score, game.combo, game.flags_placed, game.safe_cells_left, game.correct_flags, game.time_remaining,
+     status, since_start, game.radar_center_row, game.radar_center_col, game.radar_mine_count,
+     game.radar_uses_left, game.shield_uses_left, game.hint_uses_left,
+     hint_row, hint_col, timers) = state
+    game.first_click = bool(status & _FIRST_CLICK)
+    game.game_over = bool(status & _GAME_OVER)
+    game.game_won = bool(status & _GAME_WON)
+    game.radar_active = bool(status & _RADAR)
+    game.shield_active = bool(status & _SHIELD)
+    game.hint_cell = (hint_row, hint_col) if status & _HINT else None
+    with game.scheduler.pinned():
+        for _ in range(timers):
+            index, left = _TIMER.unpack_from(data, offset)
+            offset += _TIMER.size
+            if index >= len(TIMERS):
+                raise ValueError(f"Save has an unknown timer {index}")
+            game.start_timer(TIMERS[index], left)
+        game.start_time = None if game.first_click else game.now() - since_start
+        if status & _PAUSED:
+            game.scheduler.pause()
+    state, inc, has_uint32, uinteger = _RNG.unpack_from(data, offset)
+    offset += _RNG.size
+    if has_uint32 > 1 or uinteger >= 1 << 32:
+        raise ValueError("Save has a corrupt generator state")
+    game.rng.bit_generator.state = {
+        "bit_generator": "PCG64",
+        "state": {"state": int.from_bytes(state, "little"), "inc": int.from_bytes(inc, "little")},
+        "has_uint32": has_uint32, "uinteger": uinteger,
+    }
+    # The planes are read in place from the buffer; unpacking is the only copy
+    board = game.board
+    planes = [np.unpackbits(np.frombuffer(data, dtype=np.uint8, count=size, offset=offset + i * size), count=cells)
+              for i in range(5)]
+    board.mines.reshape(-1)[:] = planes[0]
+    board.revealed.reshape(-1)[:] = planes[1]
+    board.flagged.reshape(-1)[:] = planes[2]
+    board.power_ups.reshape(-1)[:] = planes[3] | planes[4] << 1
+    board.compute_neighbors()
+    # Derived state: uncollected power-ups and what the solver has seen
+    tiles = np.flatnonzero((board.power_ups != 0) & ~board.revealed)
+    tile_rows, tile_cols = np.divmod(tiles, cols)
+    game.power_up_tiles = dict(zip(zip(tile_rows.tolist(), tile_cols.tolist()),
+                                   (POWER_UP_TYPES[code] for code in board.power_ups.reshape(-1)[tiles].tolist())))
+    game.solver.notify(np.flatnonzero(board.revealed))
+    return game
+
+
+def save(game, path, compress=False):
+    """Write a snapshot; a write to a temp file then a rename keeps the old save whole if it fails"""
+    temp = path + ".tmp"
+    with open(temp, "wb") as file:
+        file.write(snapshot(game, compress))
+    os.replace(temp, path)
+
+
+def load(path, clock=None, board_pool=None):
+    """Game from a save file, memory-mapped so a huge board is read straight
+    from the page cache. None if there is no save or it cannot be read."""
+    try:
+        with open(path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            return restore(data, clock, board_pool)
+    except (OSError, ValueError, zlib.error):
+        return None
+
+
+def discard(path):
+    """Remove a save file if there is one"""
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
@@ -0,0 +1,33 @@
+# scene.py
+# Base class for full-screen views that are drawn once and then patched
+import pygame
+
+class Scene:
+    """A full-screen view whose static content is built once into a cached background"""
+    def __init__(self):
+        self.background = None
+        self._shown = False
+
+    def invalidate(self):
+        """Draw the whole screen next frame, e.g. after another view drew over it"""
+        self._shown = False
+
+    def build(self, surface):
+        """Draw the static content; called once"""
+        raise NotImplementedError
+
+    def update(self, screen):
+        """Redraw whatever changed since last frame and return its rects"""
+        return []
+
+    def draw(self, screen):
+        """Bring the screen up to date and return the rects that changed, for display.update"""
+        if self.background is None:
+            self.background = pygame.Surface(screen.get_size())
+            self.build(self.background)
+        if self._shown:
+            return self.update(screen)
+        self._shown = True
+        screen.blit(self.background, (0, 0))
+        self.update(screen)
+        return [screen.get_rect()]
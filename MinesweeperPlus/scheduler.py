@@ -0,0 +1,113 @@
+# scheduler.py
+# Named one-shot timers on a pausable game clock, kept in a min-heap by deadline
+import heapq
+from contextlib import contextmanager
+
+class Scheduler:
+    """Fires callbacks when their deadlines pass on the game clock.
+    Game time is the wrapped clock minus the time spent paused, so pausing
+    freezes every timer at once. Timers are named, one per name: scheduling
+    a name again moves its deadline. run() only looks at timers that are due,
+    so a frame costs O(expired timers) however many kinds there are.
+    Inside pinned() the clock is read once and every call sees that reading,
+    so one action cannot straddle a deadline however often it asks the time."""
+    def __init__(self, clock):
+        self.clock = clock
+        self._timers = {}  # name -> (deadline, sequence, callback)
+        self._heap = []  # (deadline, sequence, name); stale entries are skipped when popped
+        self._sequence = 0
+        self._paused_at = None  # Clock reading when paused, None while running
+        self._paused_total = 0  # Clock ms spent paused before the current pause
+        self._pinned = None  # Clock reading held by pinned(), None outside it
+
+    @property
+    def paused(self):
+        return self._paused_at is not None
+
+    def ticks(self):
+        """Clock reading in ms: the pinned one inside pinned(), the live one outside"""
+        return self.clock.get_ticks() if self._pinned is None else self._pinned
+
+    @contextmanager
+    def pinned(self, ticks=None):
+        """Hold the clock at one reading (`ticks`, or the clock now) for the block,
+        which gets that reading. Nested blocks keep the outer reading."""
+        if self._pinned is not None:
+            yield self._pinned
+            return
+        self._pinned = self.clock.get_ticks() if ticks is None else ticks
+        try:
+            yield self._pinned
+        finally:
+            self._pinned = None
+
+    def now(self):
+        """Game time in ms"""
+        ticks = self.ticks() if self._paused_at is None else self._paused_at
+        return ticks - self._paused_total
+
+    def pause(self):
+        if self._paused_at is None:
+            self._paused_at = self.ticks()
+
+    def resume(self):
+        if self._paused_at is not None:
+            self._paused_total += self.ticks() - self._paused_at
+            self._paused_at = None
+
+    def schedule(self, name, delay, callback):
+        """Call callback() once, `delay` ms of game time from now"""
+        self._sequence += 1
+        deadline = self.now() + delay
+        self._timers[name] = (deadline, self._sequence, callback)
+        heapq.heappush(self._heap, (deadline, self._sequence, name))
+
+    def cancel(self, name):
+        self._timers.pop(name, None)
+
+    def pending(self, name):
+        return name in self._timers
+
+    def remaining(self, name):
+        """Game ms until a timer fires, or None if it is not pending"""
+        timer = self._timers.get(name)
+        return None if timer is None else max(timer[0] - self.now(), 0)
+
+    def timers(self):
+        """(name, remaining ms) of every pending timer, soonest first"""
+        now = self.now()
+        return [(name, max(deadline - now, 0))
+                for name, (deadline, _, _) in sorted(self._timers.items(), key=lambda item: item[1][:2])]
+
+    def next_deadline(self):
+        """Game time of the next timer to fire; None if there is none, or while paused"""
+        if self._paused_at is not None:
+            return None
+        self._drop_stale()
+        return self._heap[0][0] if self._heap else None
+
+    def run(self):
+        """Fire every timer that is due, in deadline order; returns how many fired"""
+        if self._paused_at is not None:
+            return 0
+        fired = 0
+        with self.pinned():  # Callbacks that reschedule count from the same moment
+            now = self.now()
+            while self._heap and self._heap[0][0] <= now:
+                deadline, sequence, name = heapq.heappop(self._heap)
+                timer = self._timers.get(name)
+                if timer is None or timer[1] != sequence:
+                    continue  # Cancelled or moved
+                del self._timers[name]
+                timer[2]()
+                fired += 1
+        return fired
+
+    def _drop_stale(self):
+        heap = self._heap
+        while heap:
+            deadline, sequence, name = heap[0]
+            timer = self._timers.get(name)
+            if timer is not None and timer[1] == sequence:
+                return
+            heapq.heappop(heap)
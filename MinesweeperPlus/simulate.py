@@ -0,0 +1,67 @@
+# simulate.py
+# Headless batch runner for balance tuning; plays games on a manual clock, no window needed
+import argparse
+import time
+import numpy as np
+from constants import *
+from clock import ManualClock
+from config import GameConfig, add_arguments, from_arguments
+from game_logic import Game
+from players import PLAYERS
+
+def play_game(player, seed, config=None):
+    """Play one game to the end and return it.
+    The clock advances by the player's think time before every move, so a game
+    that would take minutes of wall time finishes as fast as the logic runs."""
+    clock = ManualClock()
+    game = Game(config, seed=seed, clock=clock)
+    rng = np.random.default_rng(seed)
+    while not (game.game_over or game.game_won):
+        clock.advance(player.think_ms)
+        # Same per-frame updates as the main loop
+        game.update()
+        if game.game_over:
+            break
+        player.move(game, rng)
+    return game
+
+
+def run_batch(player_name, games, seed=0, config=None):
+    """Play a batch of seeded games and return summary statistics"""
+    player = PLAYERS[player_name]()
+    scores = np.zeros(games)
+    durations = np.zeros(games)
+    wins = 0
+    started = time.perf_counter()
+    for i in range(games):
+        game = play_game(player, seed + i, config)
+        scores[i] = game.score
+        durations[i] = game.clock.get_ticks() / 1000
+        wins += game.game_won
+    wall_time = time.perf_counter() - started
+    return {
+        "player": player_name,
+        "board": repr(config or GameConfig()),
+        "games": games,
+        "win_rate": wins / games,
+        "mean_score": float(scores.mean()),
+        "max_score": float(scores.max()),
+        "mean_game_seconds": float(durations.mean()),
+        "wall_seconds": wall_time,
+        "games_per_second": games / wall_time,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play Minesweeper+ games headlessly and report statistics")
+    parser.add_argument("--player", choices=sorted(PLAYERS), default="basic")
+    parser.add_argument("--games", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    add_arguments(parser)
+    args = parser.parse_args()
+    stats = run_batch(args.player, args.games, args.seed, from_arguments(args))
+    for key, value in stats.items():
+        print(f"{key:>18}: {value:.3f}" if isinstance(value, float) else f"{key:>18}: {value}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+# solver.py
+# Deduction engine: finds cells that are certainly safe or certainly mines
+# using only what a player can see (revealed numbers and revealed mines)
+
+class Solver:
+    """Incremental constraint propagation over the revealed numbers of one board.
+    Each revealed number is a constraint: its hidden neighbors hold exactly
+    (number - known mines around it) mines. Three rules run in order of cost:
+      1. single-point: a constraint needing 0 mines, or as many as it has cells
+      2. subset: if A's cells are a subset of B's, B minus A holds B - A mines
+      3. enumeration: every solution of a small connected frontier component
+    Only constraints near cells that changed since the last solve are examined.
+    Flags are not trusted, since a player's flag can be wrong."""
+    def __init__(self, board, max_component=16, max_nodes=50000):
+        self.board = board
+        self.max_component = max_component  # Largest frontier component that is enumerated
+        self.max_nodes = max_nodes  # Search budget per enumerated component
+        self.safe = set()  # Hidden cells known to be safe
+        self.mines = set()  # Cells known to be mines
+        self._revealed = []  # Batches of revealed cells not yet taken in
+        self._queue = set()  # Constraints to run the cheap rules on
+        self._touched = set()  # Constraints whose component may need enumerating
+
+    def notify(self, indices):
+        """Tell the solver these cells were just revealed; the work waits for the next solve"""
+        self._revealed.append(indices)
+
+    def _absorb(self):
+        """Queue the constraints around every cell revealed since the last solve"""
+        batches, self._revealed = self._revealed, []
+        revealed = self.board.revealed.reshape(-1)
+        mines = self.board.mines.reshape(-1)
+        for index in (int(index) for indices in batches for index in indices):
+            self.safe.discard(index)
+            if mines[index]:
+                self.mines.add(index)  # A mine uncovered under a shield
+            else:
+                self._queue.add(index)
+            for neighbor in self.board.neighbor_indices(index):
+                if revealed[neighbor] and not mines[neighbor]:
+                    self._queue.add(neighbor)
+
+    def constraint(self, index):
+        """Undecided hidden neighbors of a revealed number and how many mines they hold"""
+        revealed = self.board.revealed.reshape(-1)
+        needed = int(self.board.neighbors.reshape(-1)[index])
+        cells = []
+        for neighbor in self.board.neighbor_indices(index):
+            if neighbor in self.mines:
+                needed -= 1
+            elif not revealed[neighbor] and neighbor not in self.safe:
+                cells.append(neighbor)
+        return frozenset(cells), needed
+
+    def solve(self):
+        """Run the rules on everything that changed; returns (safe, mines) sets of flat indices"""
+        self._absorb()
+        while self._queue or self._touched:
+            if self._queue:
+                self._propagate()
+            else:
+                self._enumerate_touched()
+        return self.safe, self.mines
+
+    def _learn(self, cells, is_mine):
+        """Record deduced cells and queue the constraints around them"""
+        known = self.mines if is_mine else self.safe
+        revealed = self.board.revealed.reshape(-1)
+        mines = self.board.mines.reshape(-1)
+        for index in cells:
+            if index in known:
+                continue
+            known.add(index)
+            for neighbor in self.board.neighbor_indices(index):
+                if revealed[neighbor] and not mines[neighbor]:
+                    self._queue.add(neighbor)
+
+    def _propagate(self):
+        """Single-point rule on queued constraints, then the subset rule between them and their neighbors"""
+        queue, self._queue = self._queue, set()
+        live = {}
+        for index in queue:
+            cells, needed = self.constraint(index)
+            if not cells:
+                continue
+            if needed == 0:
+                self._learn(cells, False)
+            elif needed == len(cells):
+                self._learn(cells, True)
+            else:
+                live[index] = (cells, needed)
+        if self._queue:
+            # Something was learned; rerun cheap rules before the subset pass
+            self._touched.update(live)
+            return
+        revealed = self.board.revealed.reshape(-1)
+        for index, (cells, needed) in live.items():
+            # Constraints sharing a cell with this one lie within two steps
+            row, col = divmod(index, self.board.cols)
+            for r in range(max(row - 2, 0), min(row + 3, self.board.rows)):
+                for c in range(max(col - 2, 0), min(col + 3, self.board.cols)):
+                    other = r * self.board.cols + c
+                    if other == index or not revealed[other] or self.board.mines.reshape(-1)[other]:
+                        continue
+                    other_cells, other_needed = self.constraint(other)
+                    if cells < other_cells:
+                        rest = other_cells - cells
+                        if other_needed == needed:
+                            self._learn(rest, False)
+                        elif other_needed - needed == len(rest):
+                            self._learn(rest, True)
+        self._touched.update(live)
+
+    def _component(self, start):
+        """Constraints and cells connected to a constraint through shared hidden cells"""
+        constraints = {}
+        cells = set()
+        pending = [start]
+        revealed = self.board.revealed.reshape(-1)
+        mines = self.board.mines.reshape(-1)
+        while pending:
+            index = pending.pop()
+            if index in constraints:
+                continue
+            own_cells, needed = self.constraint(index)
+            if not own_cells:
+                continue
+            constraints[index] = (own_cells, needed)
+            for cell in own_cells - cells:
+                cells.add(cell)
+                for neighbor in self.board.neighbor_indices(cell):
+                    if revealed[neighbor] and not mines[neighbor] and neighbor not in constraints:
+                        pending.append(neighbor)
+            if len(cells) > self.max_component:
+                return constraints, None
+        return constraints, cells
+
+    def _enumerate_touched(self):
+        touched, self._touched = self._touched, set()
+        seen = set()
+        for start in touched:
+            if start in seen:
+                continue
+            constraints, cells = self._component(start)
+            seen.update(constraints)
+            if cells:
+                self._enumerate(constraints, sorted(cells))
+
+    def _enumerate(self, constraints, cells):
+        """Backtrack over every mine assignment of one component; learn cells that never vary"""
+        rules = Rules(cells, constraints.values())
+        assignment = [False] * len(cells)
+        mine_counts = [0] * len(cells)
+        solutions = 0
+        nodes = 0
+
+        def place(i):
+            nonlocal solutions, nodes
+            nodes += 1
+            if nodes > self.max_nodes:
+                raise _Budget()
+            if i == len(cells):
+                solutions += 1
+                for j, is_mine in enumerate(assignment):
+                    mine_counts[j] += is_mine
+                return
+            for is_mine in (False, True):
+                if rules.assign(i, is_mine):
+                    assignment[i] = is_mine
+                    place(i + 1)
+                rules.unassign(i, is_mine)
+
+        try:
+            place(0)
+        except _Budget:
+            return
+        if not solutions:
+            return
+        self._learn([cell for cell, count in zip(cells, mine_counts) if count == 0], False)
+        self._learn([cell for cell, count in zip(cells, mine_counts) if count == solutions], True)
+
+
+class Rules:
+    """The mine counts a backtracking search must keep over one component's cells.
+    Each rule tracks the mines placed on its cells and how many are still open,
+    so a cell assignment that can no longer satisfy it is caught at once."""
+    def __init__(self, cells, constraints):
+        position = {cell: i for i, cell in enumerate(cells)}
+        self.rules = [([position[cell] for cell in own_cells], needed) for own_cells, needed in constraints]
+        self.rules_of = [[] for _ in cells]  # Rules each cell takes part in
+        for r, (members, _) in enumerate(self.rules):
+            for i in members:
+                self.rules_of[i].append(r)
+        self.reset()
+
+    def reset(self):
+        """Forget every assignment"""
+        self.mines_left = [needed for _, needed in self.rules]  # Mines still to place per rule
+        self.open_left = [len(members) for members, _ in self.rules]  # Unassigned cells per rule
+
+    def assign(self, i, is_mine):
+        """Assign cell i; False if some rule can no longer be met. Undo with unassign() either way."""
+        mines_left, open_left = self.mines_left, self.open_left
+        ok = True
+        for r in self.rules_of[i]:
+            mines_left[r] -= is_mine
+            open_left[r] -= 1
+            if not 0 <= mines_left[r] <= open_left[r]:
+                ok = False
+        return ok
+
+    def unassign(self, i, is_mine):
+        mines_left, open_left = self.mines_left, self.open_left
+        for r in self.rules_of[i]:
+            mines_left[r] += is_mine
+            open_left[r] += 1
+
+
+class _Budget(Exception):
+    """Raised when enumerating a component exceeds its node budget"""
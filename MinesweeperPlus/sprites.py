@@ -0,0 +1,79 @@
+# sprites.py
+# Pre-rendered cell appearances so drawing a cell is a single blit
+import numpy as np
+import pygame
+from constants import *
+
+NUMBER_COLORS = {
+    1: BLUE, 2: GREEN, 3: RED, 4: (0,0,128),
+    5: (128,0,0), 6: (0,128,128), 7: BLACK, 8: GRAY
+}
+POWER_UP_COLORS = {
+    "radar": CYAN,
+    "shield": GOLD,
+    "hint": LIME
+}
+MINE_CONTENT = 9  # Content index used for a mine; 0-8 are neighbor counts
+
+def appearance_codes(board, indices):
+    """Atlas code for each flat cell index.
+    Hidden cells are 0 (plain) or 1 (flagged). Revealed cells are
+    2 + (content * 2 + flagged) * 4 + power-up code."""
+    revealed = board.revealed.reshape(-1)[indices]
+    flagged = board.flagged.reshape(-1)[indices].astype(np.intp)
+    content = np.where(board.mines.reshape(-1)[indices], MINE_CONTENT, board.neighbors.reshape(-1)[indices])
+    shown = 2 + (content.astype(np.intp) * 2 + flagged) * 4 + board.power_ups.reshape(-1)[indices]
+    return np.where(revealed, shown, flagged)
+
+
+class SpriteAtlas:
+    """Every distinct cell appearance, rendered once per Renderer"""
+    def __init__(self, font_medium, cell_size=CELL_SIZE):
+        self.cell_size = cell_size
+        self.surfaces = [self._render_hidden(False), self._render_hidden(True)]
+        for content in range(MINE_CONTENT + 1):
+            for flagged in (False, True):
+                for power_up_type in POWER_UP_TYPES:
+                    self.surfaces.append(self._render_revealed(font_medium, content, flagged, power_up_type))
+
+    def code(self, board, row, col):
+        return int(appearance_codes(board, row * board.cols + col))
+
+    def _render_hidden(self, flagged):
+        size = self.cell_size
+        surface = pygame.Surface((size, size))
+        pygame.draw.rect(surface, GRAY, (0, 0, size, size))
+        pygame.draw.rect(surface, BLACK, (0, 0, size, size), 2)
+        if flagged:
+            self._draw_flag(surface)
+        return surface
+
+    def _render_revealed(self, font_medium, content, flagged, power_up_type):
+        size = self.cell_size
+        surface = pygame.Surface((size, size))
+        pygame.draw.rect(surface, DARK_GRAY, (0, 0, size, size))
+        pygame.draw.rect(surface, BLACK, (0, 0, size, size), 1)
+        # Draw mine or number
+        if content == MINE_CONTENT:
+            pygame.draw.circle(surface, RED, (size // 2, size // 2), size * 3 // 8)
+        elif content > 0:
+            text = font_medium.render(str(content), True, NUMBER_COLORS[content])
+            surface.blit(text, text.get_rect(center=(size // 2, size // 2)))
+        # Revealed mines keep their flag on the loss screen
+        if flagged:
+            self._draw_flag(surface)
+        # Draw power-up icon in the bottom-right corner
+        if power_up_type:
+            power_up_size = size // 4  # smaller to avoid blocking number
+            padding = size // 10
+            center_x = size - power_up_size // 2 - padding
+            center_y = size - power_up_size // 2 - padding
+            color = POWER_UP_COLORS.get(power_up_type, WHITE)
+            pygame.draw.circle(surface, color, (center_x, center_y), power_up_size // 2)
+        return surface
+
+    def _draw_flag(self, surface):
+        # Drawn on a 40px grid and scaled to the cell
+        s = self.cell_size / 40
+        pygame.draw.polygon(surface, RED, [(15 * s, 10 * s), (35 * s, 20 * s), (15 * s, 30 * s)])
+        pygame.draw.line(surface, BLACK, (15 * s, 10 * s), (15 * s, 40 * s), max(round(3 * s), 1))
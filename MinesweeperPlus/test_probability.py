@@ -0,0 +1,76 @@
+# test_probability.py
+# Mine probabilities checked against brute force over every layout on small boards
+import itertools
+import numpy as np
+import pytest
+from board import BoardState
+from probability import ProbabilityMap
+
+ROWS, COLS, MINES = 5, 5, 6
+
+def brute_force(board, mine_count):
+    """Mine probability of each cell over every layout that agrees with the numbers and flags"""
+    size = board.rows * board.cols
+    known = (board.flagged | (board.revealed & board.mines)).reshape(-1)
+    hidden = np.flatnonzero(~(board.revealed | board.flagged).reshape(-1))
+    numbers = np.flatnonzero((board.revealed & ~board.mines).reshape(-1))
+    adjacent = np.zeros((size, numbers.size), dtype=int)
+    for j, number in enumerate(numbers.tolist()):
+        adjacent[board.neighbor_indices(number), j] = 1
+    picks = np.array(list(itertools.combinations(hidden.tolist(), mine_count - int(known.sum()))), dtype=int)
+    layouts = np.tile(known, (len(picks), 1))
+    layouts[np.arange(len(picks))[:, None], picks] = True
+    valid = layouts[((layouts @ adjacent) == board.neighbors.reshape(-1)[numbers]).all(axis=1)]
+    return valid.mean(axis=0).reshape(board.rows, board.cols)
+
+
+def positions(seed):
+    """Boards along a seeded game with correct flags, some of them taken back"""
+    rng = np.random.default_rng(seed)
+    board = BoardState(ROWS, COLS)
+    board.place_mines(MINES, rng, 2, 2, 1)
+    board.flood_reveal(2, 2)
+    while True:
+        yield board
+        hidden = np.flatnonzero(~(board.revealed | board.flagged).reshape(-1))
+        safe = hidden[~board.mines.reshape(-1)[hidden]]
+        if not safe.size:
+            return
+        if rng.random() < 0.2 and board.flagged.any():
+            board.flagged.reshape(-1)[rng.choice(np.flatnonzero(board.flagged))] = False
+        elif rng.random() < 0.3 and hidden.size > safe.size:
+            board.flagged.reshape(-1)[rng.choice(np.setdiff1d(hidden, safe))] = True
+        else:
+            board.flood_reveal(*divmod(int(rng.choice(safe)), COLS))
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_matches_brute_force(seed):
+    probabilities = None
+    for board in positions(seed):
+        if probabilities is None:
+            probabilities = ProbabilityMap(board, MINES, budget_ms=10000)
+        chances = probabilities.compute()
+        assert probabilities.exact
+        assert np.allclose(chances, brute_force(board, MINES))
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_later_calls_become_exact(seed):
+    board = next(positions(seed))
+    probabilities = ProbabilityMap(board, MINES, budget_ms=0.05)
+    for _ in range(1000):
+        chances = probabilities.compute()
+        if probabilities.exact:
+            break
+    assert probabilities.exact
+    assert np.allclose(chances, brute_force(board, MINES))
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_components_follow_the_board(seed):
+    probabilities = None
+    for board in positions(seed):
+        if probabilities is None:
+            probabilities = ProbabilityMap(board, MINES)
+        assert probabilities.components() == ProbabilityMap(board, MINES).components()
@@ -0,0 +1,47 @@
+# test_savegame.py
+# Snapshots load back as the same game, and a cut-off or damaged save is refused
+import pytest
+from clock import ManualClock
+from config import PRESETS
+from game_logic import Game
+from journal import digest
+from savegame import snapshot, load
+
+def played():
+    """A seeded classic game a few moves in, with the radar and the shield running"""
+    game = Game(PRESETS["classic"], seed=3, clock=ManualClock())
+    game.reveal_cell(7, 7)
+    game.radar_at(3, 3)
+    game.toggle_shield()
+    game.toggle_flag(0, 0)
+    return game
+
+
+def load_bytes(tmp_path, data):
+    path = str(tmp_path / "save.bin")
+    with open(path, "wb") as file:
+        file.write(data)
+    return load(path, clock=ManualClock())
+
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_round_trip(tmp_path, compress):
+    game = played()
+    restored = load_bytes(tmp_path, snapshot(game, compress))
+    assert (digest(restored), restored.board.mines.tobytes()) == (digest(game), game.board.mines.tobytes())
+
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_truncated_save_is_refused(tmp_path, compress):
+    data = snapshot(played(), compress)
+    for size in range(len(data)):
+        assert load_bytes(tmp_path, data[:size]) is None
+
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_flipped_bit_is_refused(tmp_path, compress):
+    data = snapshot(played(), compress)
+    for bit in range(len(data) * 8):
+        damaged = bytearray(data)
+        damaged[bit // 8] ^= 1 << bit % 8
+        assert load_bytes(tmp_path, bytes(damaged)) is None
@@ -0,0 +1,125 @@
+# tournament.py
+# Multi-core simulation runner: shards seeded games over a process pool and
+# merges per-shard statistics as they arrive, never keeping per-game records
+import argparse
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from constants import *
+from config import add_arguments, from_arguments
+from players import PLAYERS
+from simulate import play_game
+
+class Stats:
+    """Running totals for a stream of games; two Stats merge into one"""
+    def __init__(self):
+        self.games = 0
+        self.wins = 0
+        self.score_sum = 0.0
+        self.score_squares = 0.0
+        self.score_min = math.inf
+        self.score_max = -math.inf
+        self.seconds_sum = 0.0  # Game-clock seconds played
+
+    def add(self, game):
+        score = game.score
+        self.games += 1
+        self.wins += game.game_won
+        self.score_sum += score
+        self.score_squares += score * score
+        self.score_min = min(self.score_min, score)
+        self.score_max = max(self.score_max, score)
+        self.seconds_sum += game.clock.get_ticks() / 1000
+
+    def merge(self, other):
+        self.games += other.games
+        self.wins += other.wins
+        self.score_sum += other.score_sum
+        self.score_squares += other.score_squares
+        self.score_min = min(self.score_min, other.score_min)
+        self.score_max = max(self.score_max, other.score_max)
+        self.seconds_sum += other.seconds_sum
+
+    def summary(self):
+        games = max(self.games, 1)
+        mean = self.score_sum / games
+        variance = max(self.score_squares / games - mean * mean, 0.0)
+        return {
+            "games": self.games,
+            "win_rate": self.wins / games,
+            "mean_score": mean,
+            "score_stddev": math.sqrt(variance),
+            "min_score": self.score_min,
+            "max_score": self.score_max,
+            "mean_game_seconds": self.seconds_sum / games,
+        }
+
+
+def play_shard(player_name, first_seed, count, config):
+    """Worker entry point: play seeds [first_seed, first_seed + count) and return their Stats"""
+    player = PLAYERS[player_name]()
+    stats = Stats()
+    for seed in range(first_seed, first_seed + count):
+        stats.add(play_game(player, seed, config))
+    return stats
+
+
+def run_tournament(player_names, games, seed=0, workers=None, shard_size=500, config=None):
+    """Play `games` seeded games per player across a process pool.
+    Every player sees the same seeds, so their results are directly comparable.
+    Only a couple of shards per worker are in flight at once, so memory stays flat
+    however many games are requested. Returns {player name: Stats}."""
+    workers = workers or os.cpu_count() or 1
+    totals = {name: Stats() for name in player_names}
+    shards = ((name, start, min(shard_size, games - start))
+              for start in range(0, games, shard_size) for name in player_names)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        running = {}
+        for name, start, count in shards:
+            running[pool.submit(play_shard, name, seed + start, count, config)] = name
+            if len(running) >= workers * 2:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    totals[running.pop(future)].merge(future.result())
+        for future in list(running):
+            totals[running.pop(future)].merge(future.result())
+    return totals
+
+
+def _score_item(item):
+    """One KEY=POINTS option as a (key, points) pair; argparse reports a bad one as a usage error"""
+    key, _, value = item.partition("=")
+    if key not in SCORING:
+        raise argparse.ArgumentTypeError(f"unknown scoring key {key!r}; expected one of {', '.join(SCORING)}")
+    try:
+        return key, int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"{item!r} needs whole points, as in {key}=10") from None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play seeded Minesweeper+ games on every core and compare players")
+    parser.add_argument("--players", nargs="+", choices=sorted(PLAYERS), default=["basic"])
+    parser.add_argument("--games", type=int, default=100000, help="games per player")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None, help="defaults to one per core")
+    parser.add_argument("--shard-size", type=int, default=500)
+    add_arguments(parser)
+    parser.add_argument("--score", nargs="*", type=_score_item, default=[], metavar="KEY=POINTS",
+                        help=f"override scoring, keys: {', '.join(SCORING)}")
+    args = parser.parse_args()
+    started = time.perf_counter()
+    config = from_arguments(args, scoring=dict(args.score))
+    totals = run_tournament(args.players, args.games, args.seed, args.workers, args.shard_size, config)
+    print(config)
+    wall_time = time.perf_counter() - started
+    for name, stats in totals.items():
+        print(f"[{name}]")
+        for key, value in stats.summary().items():
+            print(f"{key:>18}: {value:.3f}" if isinstance(value, float) else f"{key:>18}: {value}")
+    games = sum(stats.games for stats in totals.values())
+    print(f"{games} games in {wall_time:.1f}s ({games / wall_time:.0f} games/s)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+# viewport.py
+# Camera over the board and a cache of pre-rendered board chunks, so drawing
+# costs depend on the window size rather than the board size
+from collections import OrderedDict
+import numpy as np
+import pygame
+from constants import *
+from sprites import SpriteAtlas, appearance_codes
+
+CHUNK = 32  # Cells per chunk side
+ZOOM_LEVELS = (4, 6, 8, 12, 16, 20, 24, 32, 40, 48)  # Cell sizes the camera steps through
+CHUNK_CACHE_PIXELS = 24_000_000  # About 96 MB of chunk surfaces
+
+class Viewport:
+    """Which part of the board is on screen, and at what cell size.
+    `rect` is the fixed screen area the board is shown in; (x, y) is the
+    board pixel at its top-left, negative when the board is smaller than
+    the view and sits centered in it."""
+    def __init__(self, area, rows, cols, cell_size):
+        self.rows = rows
+        self.cols = cols
+        self.cell_size = cell_size
+        self.levels = sorted(set(ZOOM_LEVELS) | {cell_size})
+        # The view hugs the board at its starting size, up to the available area
+        self.rect = pygame.Rect(0, 0, min(cols * cell_size, area.width), min(rows * cell_size, area.height))
+        self.rect.center = area.center
+        self.x = self.y = 0
+        self._clamp()
+
+    @property
+    def origin(self):
+        """Screen position of the board's top-left corner"""
+        return self.rect.x - self.x, self.rect.y - self.y
+
+    def board_rect(self):
+        """Visible part of the board, in screen coordinates"""
+        size = self.cell_size
+        return pygame.Rect(*self.origin, self.cols * size, self.rows * size).clip(self.rect)
+
+    def pan(self, dx, dy):
+        """Scroll by screen pixels; returns whether the view moved"""
+        before = (self.x, self.y)
+        self.x += dx
+        self.y += dy
+        self._clamp()
+        return (self.x, self.y) != before
+
+    def zoom(self, steps, anchor=None):
+        """Step through the zoom levels, keeping the board point under `anchor` (a screen
+        position, the view center by default) in place; returns whether the zoom changed"""
+        level = self.levels.index(self.cell_size)
+        size = self.levels[min(max(level + steps, 0), len(self.levels) - 1)]
+        if size == self.cell_size:
+            return False
+        ax, ay = anchor or self.rect.center
+        # Board position under the anchor, in cells, before and after
+        bx = (ax - self.origin[0]) / self.cell_size
+        by = (ay - self.origin[1]) / self.cell_size
+        self.cell_size = size
+        self.x = round(bx * size - (ax - self.rect.x))
+        self.y = round(by * size - (ay - self.rect.y))
+        self._clamp()
+        return True
+
+    def cell_at(self, x, y):
+        """(row, col) under a screen position, or None"""
+        if not self.rect.collidepoint(x, y):
+            return None
+        row = (y - self.origin[1]) // self.cell_size
+        col = (x - self.origin[0]) // self.cell_size
+        if 0 <= row < self.rows and 0 <= col < self.cols:
+            return row, col
+        return None
+
+    def visible_chunks(self):
+        """(chunk row, chunk col) of every chunk overlapping the view"""
+        span = CHUNK * self.cell_size
+        first_row = max(self.y // span, 0)
+        first_col = max(self.x // span, 0)
+        last_row = min((self.y + self.rect.height - 1) // span, (self.rows - 1) // CHUNK)
+        last_col = min((self.x + self.rect.width - 1) // span, (self.cols - 1) // CHUNK)
+        return [(chunk_row, chunk_col)
+                for chunk_row in range(first_row, last_row + 1)
+                for chunk_col in range(first_col, last_col + 1)]
+
+    def _clamp(self):
+        for axis, view, board in (("x", self.rect.width, self.cols * self.cell_size),
+                                  ("y", self.rect.height, self.rows * self.cell_size)):
+            if board <= view:
+                setattr(self, axis, (board - view) // 2)
+            else:
+                setattr(self, axis, min(max(getattr(self, axis), 0), board - view))
+
+
+class ChunkCache:
+    """Board chunks rendered once per zoom level and kept until evicted (least
+    recently used first, within a pixel budget). A chunk is patched in place
+    when its cells change rather than rendered again."""
+    def __init__(self, max_pixels=CHUNK_CACHE_PIXELS):
+        self.max_pixels = max_pixels
+        self.atlases = {}  # Cell size -> SpriteAtlas
+        self.chunks = OrderedDict()  # (cell size, chunk row, chunk col) -> Surface
+        self.pixels = 0
+
+    def clear(self):
+        self.chunks.clear()
+        self.pixels = 0
+
+    def atlas(self, size):
+        if size not in self.atlases:
+            # Cell numbers are drawn at the height of a cell
+            self.atlases[size] = SpriteAtlas(pygame.font.Font(None, size), size)
+        return self.atlases[size]
+
+    def chunk(self, board, size, chunk_row, chunk_col):
+        """Surface for one chunk at one cell size, rendered on first use"""
+        key = (size, chunk_row, chunk_col)
+        surface = self.chunks.get(key)
+        if surface is not None:
+            self.chunks.move_to_end(key)
+            return surface
+        rows = np.arange(chunk_row * CHUNK, min((chunk_row + 1) * CHUNK, board.rows))
+        cols = np.arange(chunk_col * CHUNK, min((chunk_col + 1) * CHUNK, board.cols))
+        surface = pygame.Surface((cols.size * size, rows.size * size))
+        indices = (rows[:, None] * board.cols + cols).reshape(-1)
+        self._blit_cells(surface, board, size, indices, chunk_row, chunk_col)
+        self.chunks[key] = surface
+        self.pixels += surface.get_width() * surface.get_height()
+        while self.pixels > self.max_pixels and len(self.chunks) > 1:
+            _, evicted = self.chunks.popitem(last=False)
+            self.pixels -= evicted.get_width() * evicted.get_height()
+        return surface
+
+    def patch(self, board, size, indices):
+        """Bring cached chunks up to date with changed cells. Chunks at the
+        current size are patched; those at other sizes are dropped."""
+        if not len(indices):
+            return
+        per_row = (board.cols - 1) // CHUNK + 1
+        chunk_of = indices // board.cols // CHUNK * per_row + indices % board.cols // CHUNK
+        # Group the changed cells by chunk with one sort
+        order = np.argsort(chunk_of, kind="stable")
+        chunk_ids, starts = np.unique(chunk_of[order], return_index=True)
+        for chunk_id, cells in zip(chunk_ids.tolist(), np.split(indices[order], starts[1:])):
+            chunk_row, chunk_col = divmod(chunk_id, per_row)
+            for level in self.atlases:
+                key = (level, chunk_row, chunk_col)
+                if key not in self.chunks:
+                    continue
+                if level == size:
+                    self._blit_cells(self.chunks[key], board, size, cells, chunk_row, chunk_col)
+                else:
+                    surface = self.chunks.pop(key)
+                    self.pixels -= surface.get_width() * surface.get_height()
+
+    def _blit_cells(self, surface, board, size, indices, chunk_row, chunk_col):
+        sprites = self.atlas(size).surfaces
+        rows, cols = np.divmod(indices, board.cols)
+        xs = ((cols - chunk_col * CHUNK) * size).tolist()
+        ys = ((rows - chunk_row * CHUNK) * size).tolist()
+        codes = appearance_codes(board, indices).tolist()
+        surface.blits([(sprites[code], (x, y)) for code, x, y in zip(codes, xs, ys)], doreturn=False)